@@ -3,7 +3,9 @@
 import azure.functions as func
 
 from scrapeNewEntries import bp as bp_scrapeNewEntries
+from ingestNewEntries import bp as bp_ingestNewEntries
 
 app = func.FunctionApp()
 
-app.register_functions(bp_scrapeNewEntries)
\ No newline at end of file
+app.register_functions(bp_scrapeNewEntries)
+app.register_functions(bp_ingestNewEntries)
\ No newline at end of file
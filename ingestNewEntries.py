@@ -0,0 +1,59 @@
+# ingestNewEntries.py
+import sys, os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "freelanceBot"))
+
+import datetime
+import json
+import logging
+from time import perf_counter
+
+import azure.functions as func
+
+# NCRONTAB (mit Sekunden): alle 15 Minuten
+INGEST_SCHEDULE = "0 */15 * * * *"
+# So viele Ergebnisseiten pro Lauf (je pageSize=100)
+INGEST_PAGES = int(os.getenv("INGEST_PAGES", "1"))
+
+
+def ingest_new_entries(table = None, scraper = None) -> dict:
+    """
+    Scraped die aktuellen Projekt-URLs, gleicht sie mit der DefaultTable ab und
+    schreibt alle neuen URLs in einem einzigen Upload.
+    Returns:
+        dict: {"scraped", "new", "seen", "seconds"}
+    """
+    # Erst hier importieren: pandas und das Azure Storage SDK kosten sonst bei jedem Kaltstart
+    from entryScraper import ScrapeNewEntries
+    from utils.DefaultTable import DefaultTable
+
+    t0 = perf_counter()
+    if scraper is None:
+        scraper = ScrapeNewEntries(pages=INGEST_PAGES)
+    urls = list(dict.fromkeys(scraper.scrape()))
+    # nicht "table or ...": eine leere DefaultTable ist falsy (__len__)
+    own_table = table is None
+    if own_table:
+        table = DefaultTable()
+    try:
+        new_urls = table.add_new_urls(urls, date=datetime.date.today().isoformat())
+    finally:
+        if own_table:
+            table.close()
+    return {
+        "scraped": len(urls),
+        "new": len(new_urls),
+        "seen": len(urls) - len(new_urls),
+        "seconds": round(perf_counter() - t0, 3),
+    }
+
+
+bp = func.Blueprint()
+
+@bp.function_name(name = "ingestNewEntries")
+@bp.timer_trigger(schedule=INGEST_SCHEDULE, arg_name="timer", run_on_startup=False, use_monitor=False)
+
+def ingestNewEntries(timer: func.TimerRequest) -> None:
+    if timer.past_due:
+        logging.warning("ingestNewEntries läuft verspätet")
+    stats = ingest_new_entries()
+    logging.info("ingestNewEntries %s", json.dumps(stats))
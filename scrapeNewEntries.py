@@ -1,10 +1,122 @@
 # function_app.py
+import sys, os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "freelanceBot"))
+
 import json
 import logging
+import threading
+import time
 
 import azure.functions as func
 from azure.functions import FunctionApp, AuthLevel
-from ScrapeNewEntries import ScrapeNewEntries
+
+# Höchstens ein Scrape von freelance.de pro TTL-Fenster, alle Requests dazwischen bekommen den Cache
+CACHE_TTL_SECONDS = int(os.getenv("SCRAPE_CACHE_TTL_SECONDS", "300"))
+# So viele URLs merkt sich der Seen-Set für den since-Cursor (älteste fliegen zuerst raus)
+SEEN_MAX_URLS = 5000
+# Seen-Set und Cursor liegen als Blob neben der Tabelle (Speicher wie utils/DefaultTable, siehe utils/BlobStore.default_store),
+# damit Kaltstarts und mehrere Instanzen denselben Stand sehen. "off" = nur im Speicher der Instanz
+SEEN_STATE_BLOB = os.getenv("SCRAPE_SEEN_BLOB", "scrape_seen.json")
+SEEN_STATE_CONTAINER = "freelance-bot-list"
+# so oft wird nach einem Konflikt (anderer Writer) neu geladen, gemergt und erneut geschrieben
+SEEN_SAVE_RETRIES = 3
+
+_cache = {"urls": None, "fetched_at": 0.0, "cursor": 0}
+_first_seen = {}                 # url -> Cursor (ms seit Epoch) des Scrapes, in dem sie zuerst auftauchte
+_seen_state = {"store": None, "etag": None, "loaded": False}
+_lock = threading.Lock()         # Single-Flight: nur ein Request scraped, die anderen warten und nutzen das Ergebnis
+
+
+def _merge_seen(data: bytes):
+    """
+    Übernimmt einen gespeicherten Stand: pro URL gilt der früheste Cursor, der Cursor selbst ist das Maximum.
+    """
+    state = json.loads(data)
+    for url, cursor in state["first_seen"].items():
+        _first_seen[url] = min(cursor, _first_seen.get(url, cursor))
+    _cache["cursor"] = max(_cache["cursor"], state["cursor"])
+    # Reihenfolge nach Cursor, damit beim Kürzen weiter die ältesten URLs rausfliegen
+    ordered = sorted(_first_seen.items(), key=lambda item: item[1])
+    _first_seen.clear()
+    _first_seen.update(ordered[-SEEN_MAX_URLS:])
+
+
+def _load_seen():
+    """
+    Lädt beim ersten Scrape der Instanz den gespeicherten Stand (nur unter _lock aufrufen).
+    Fehler werden nur geloggt: dann startet die Instanz wie früher mit leerem Seen-Set.
+    """
+    if _seen_state["loaded"] or SEEN_STATE_BLOB == "off":
+        return
+    _seen_state["loaded"] = True
+    try:
+        from utils.BlobStore import default_store
+        _seen_state["store"] = default_store(container_name=SEEN_STATE_CONTAINER)
+        data, etag = _seen_state["store"].download_versioned(SEEN_STATE_BLOB)
+        if data is not None:
+            _merge_seen(data)
+        _seen_state["etag"] = etag
+    except Exception:
+        _seen_state["store"] = None
+        logging.warning("Seen-Set nicht geladen, since-Cursor gilt nur für diese Instanz", exc_info=True)
+
+
+def _save_seen():
+    """
+    Schreibt Seen-Set und Cursor bedingt per ETag (nur unter _lock aufrufen). Hat eine andere Instanz
+    inzwischen geschrieben, wird ihr Stand gemergt und erneut versucht. Fehler werden nur geloggt.
+    """
+    from utils.BlobStore import BlobChanged
+    store = _seen_state["store"]
+    if store is None:
+        return
+    try:
+        for _ in range(SEEN_SAVE_RETRIES):
+            data = json.dumps({"cursor": _cache["cursor"], "first_seen": _first_seen}).encode()
+            etag = _seen_state["etag"]
+            try:
+                _seen_state["etag"] = store.upload(SEEN_STATE_BLOB, data, if_match=etag, if_none_match=etag is None)
+                return
+            except BlobChanged:
+                remote, _seen_state["etag"] = store.download_versioned(SEEN_STATE_BLOB)
+                if remote is not None:
+                    _merge_seen(remote)
+        logging.warning("Seen-Set nach %d Konflikten nicht gespeichert", SEEN_SAVE_RETRIES)
+    except Exception:
+        logging.warning("Seen-Set nicht gespeichert", exc_info=True)
+
+
+def _scrape_cached(since: int = None) -> tuple[list, bool, int, float]:
+    """
+    Liefert die URLs des letzten Scrapes, solange er jünger als CACHE_TTL_SECONDS ist.
+    Sonst scraped genau ein Request neu, parallele Requests warten auf dieses Ergebnis.
+    Filter und Cursor werden unter demselben Lock bestimmt, damit beide zum selben Scrape gehören.
+    Args:
+        since: nur URLs, die nach diesem Cursor zum ersten Mal gesehen wurden (None = alle)
+    Returns:
+        (urls, cache_hit, cursor, Alter des Scrapes in Sekunden)
+    """
+    with _lock:
+        cache_hit = _cache["urls"] is not None and time.monotonic() - _cache["fetched_at"] < CACHE_TTL_SECONDS
+        if not cache_hit:
+            _load_seen()
+            # requests/lxml erst beim ersten Scrape laden, nicht beim Kaltstart der Function App
+            from entryScraper import ScrapeNewEntries
+            urls = ScrapeNewEntries().scrape()
+            cursor = max(int(time.time() * 1000), _cache["cursor"] + 1)
+            for url in urls:
+                if url not in _first_seen:
+                    _first_seen[url] = cursor
+            while len(_first_seen) > SEEN_MAX_URLS:
+                del _first_seen[next(iter(_first_seen))]
+            _cache.update(urls=urls, fetched_at=time.monotonic(), cursor=cursor)
+            _save_seen()
+
+        urls = _cache["urls"]
+        if since is not None:
+            # URLs ohne Eintrag (schon aus dem Seen-Set verdrängt) gelten als alt
+            urls = [u for u in urls if _first_seen.get(u, since) > since]
+        return urls, cache_hit, _cache["cursor"], time.monotonic() - _cache["fetched_at"]
 
 
 bp = func.Blueprint()
@@ -13,13 +125,31 @@ bp = func.Blueprint()
 @bp.route(route="scrape-new-entries", auth_level=func.AuthLevel.ANONYMOUS, methods=["GET"])
 
 def scrapeNewEntries(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Liefert die aktuellen Projekt-URLs als JSON-Liste.
+    ?since=<cursor> liefert nur URLs, die nach diesem Cursor zum ersten Mal gesehen wurden.
+    Den Cursor für den nächsten Aufruf enthält der Header X-Cursor.
+    Seen-Set und Cursor überstehen Kaltstarts (Blob SEEN_STATE_BLOB). Fehlt der Blob (erster Lauf)
+    oder ist er nicht erreichbar, gilt beim ersten Scrape jede URL als neu.
+    """
+    since = req.params.get("since")
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return func.HttpResponse("since must be an integer cursor", status_code=400)
     try:
-        urls = ScrapeNewEntries().scrape()
+        urls, cache_hit, cursor, age = _scrape_cached(since)
         return func.HttpResponse(
             json.dumps(urls),
             status_code=200,
-            mimetype="application/json"
+            mimetype="application/json",
+            headers={
+                "X-Cursor": str(cursor),
+                "X-Cache": "HIT" if cache_hit else "MISS",
+                "X-Cache-Age": f"{age:.0f}",
+            },
         )
     except Exception as e:
         logging.exception("Scrape fehlgeschlagen")
-        return func.HttpResponse(f"Error: {e}", status_code=500)
\ No newline at end of file
+        return func.HttpResponse(f"Error: {e}", status_code=500)
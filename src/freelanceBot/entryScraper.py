@@ -1,16 +1,123 @@
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from time import perf_counter
+import threading
 import requests
-from lxml import html
+from utils.extractors import parse_listing
+
+MAX_PAGES_IN_PARALLEL = 4
+REQUEST_TIMEOUT_SECONDS = 20
+
+# Shared across invocations: the Azure Functions worker keeps the process (and thus these) alive
+_session = None
+_session_lock = threading.Lock()
+# url -> {"etag", "last_modified", "urls"} of the last 200 response, for conditional GETs
+_page_cache = {}
+_page_cache_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session (keep-alive, one connection per parallel page).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_PAGES_IN_PARALLEL)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def page_url(url: str, page: int) -> str:
+    """
+    Returns url with the query parameter page set to the given page number.
+    """
+    parts = urlparse(url)
+    query = parse_qs(parts.query)
+    query["page"] = [str(page)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
 
 class ScrapeNewEntries:
     """
     Scraper for freelance.de projects page.
     Fetches the page and extracts project URLs.
+    - pooled session reused across calls
+    - conditional GETs (If-None-Match / If-Modified-Since), an unchanged page is not parsed again
+    - optionally several result pages fetched in parallel, URLs deduplicated
+    - optionally every fetched page stored in a utils.PageArchive.PageArchive (archive)
     """
-    def __init__(self, url: str = "https://www.freelance.de/projekte?remotePreference=remote_remote--remote&pageSize=100"):
+    def __init__(self, url: str = "https://www.freelance.de/projekte?remotePreference=remote_remote--remote&pageSize=100", pages: int = 1, archive = None):
         self.url = url
+        self.pages = max(1, pages)
+        self.archive = archive
+
+    def _fetch_page(self, url: str) -> dict:
+        """
+        Conditional GET of one result page.
+        Returns:
+            dict: {"url", "status", "cache_hit", "elapsed", "urls"}
+        """
+        t0 = perf_counter()
+        with _page_cache_lock:
+            cached = _page_cache.get(url)
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+        if response.status_code == 304 and cached:
+            return {"url": url, "status": 304, "cache_hit": True,
+                    "elapsed": perf_counter() - t0, "urls": cached["urls"]}
+        response.raise_for_status()
+        if self.archive is not None:
+            self.archive.put(url, response.content, "listing", response.status_code,
+                             response.headers.get("Content-Type"))
+
+        # Project cards (utils/extractors.py), URLs made absolute
+        full_urls = [card["url"] for card in parse_listing(response.content, base_url=url)]
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            with _page_cache_lock:
+                _page_cache[url] = {"etag": etag, "last_modified": last_modified, "urls": full_urls}
+        return {"url": url, "status": response.status_code, "cache_hit": False,
+                "elapsed": perf_counter() - t0, "urls": full_urls}
+
+    def scrape_with_meta(self) -> dict:
+        """
+        Fetches self.pages result pages (in parallel if more than one) and parses project links.
+        Returns:
+            dict: {"urls": deduplicated project URLs in page order,
+                   "pages": per-page metadata (status, cache_hit, elapsed),
+                   "cache_hits": number of pages answered with 304,
+                   "elapsed": total seconds}
+        """
+        t0 = perf_counter()
+        urls = [self.url] if self.pages == 1 else [page_url(self.url, p) for p in range(1, self.pages + 1)]
+        if len(urls) == 1:
+            pages = [self._fetch_page(urls[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(MAX_PAGES_IN_PARALLEL, len(urls))) as ex:
+                pages = list(ex.map(self._fetch_page, urls))
+
+        full_urls = list(dict.fromkeys(u for p in pages for u in p["urls"]))
+        return {
+            "urls": full_urls,
+            "pages": [{k: v for k, v in p.items() if k != "urls"} for p in pages],
+            "cache_hits": sum(p["cache_hit"] for p in pages),
+            "elapsed": perf_counter() - t0,
+        }
 
     def scrape(self) -> list[str]:
         """
@@ -18,16 +125,9 @@ class ScrapeNewEntries:
         Returns:
             List[str]: List of full project URLs.
         """
-        response = requests.get(self.url)
-        response.raise_for_status()
-        tree = html.fromstring(response.content)
-        # Extract hrefs from project cards
-        hrefs = tree.xpath('//search-project-card/a/@href')
-        # Build absolute URLs
-        full_urls = [requests.compat.urljoin(self.url, href) for href in hrefs]
-        return full_urls
+        return self.scrape_with_meta()["urls"]
 
 if __name__ == "__main__":
     #target_url = "https://www.freelance.de/projekte?remotePreference=remote_remote--remote&pageSize=100"
     fls = ScrapeNewEntries()
-    print(fls.scrape())
\ No newline at end of file
+    print(fls.scrape())
@@ -4,8 +4,25 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeoutError
 from dataclasses import dataclass
 import os, re
-from utils.KVManager import KeyVaultManager
-from time import sleep
+from utils.KVManager import get_cached_secret
+from utils.PagePool import PagePool
+from utils.Waiter import ReadinessWaiter
+from utils.HttpDetailFetcher import HttpDetailFetcher
+from utils.RequestPolicy import RequestPolicy
+from utils.extractors import (
+    DETAIL_FIELDS, DETAIL_FIELDS_JS, LISTING_CARD_XPATH, LISTING_CARDS_JS, LISTING_FIELDS, TOTAL_HITS_TEXTS_JS,
+    is_complete, total_hits_from_json, total_hits_from_texts,
+)
+from utils.SeenIndex import SeenProjectIndex
+from utils.CheckpointSink import CheckpointSink
+from utils.PageArchive import PageArchive
+from urllib.parse import urljoin
+from collections import Counter
+from datetime import timedelta
+from math import ceil
+from pathlib import Path
+from time import perf_counter
+import json
 import pandas as pd
 
 ######## CONFIGURATIONS ############
@@ -14,14 +31,91 @@ PATH_NEW_RAW = "new_projects_raw.xlsx"
 PATH_NEW_AGENCIES = "agencies.xlsx"
 PATH_CLEANED = "agencies_new_cleaned.xlsx"
 PATH_ENRICHED = "agencies_enriched.xlsx"
+PATH_SEEN = "seen_projects.jsonl"
+PATH_STORAGE_STATE = ".auth/freelance_state.json"
+PATH_CHECKPOINT = "new_projects_checkpoint.jsonl"
+
+# Fortschrittsausgabe der Detailphase alle so viele Projekte
+PROGRESS_EVERY = 20
 
 RELEVANT_COLS = ["company", "person", "email"]
+INTEL_COLS = ["url", "project_name", "project_description", "company", "person", "email"]
+
+# Basis aller freelance.de-URLs, für Benchmarks gegen tools/replay_server.py überschreibbar (base_url)
+BASE_URL = "https://www.freelance.de"
+
+# Seite, die nur eingeloggt ohne Redirect auf den Login ausgeliefert wird (günstiger Session-Check per HTTP)
+SESSION_CHECK_PATH = "/myfreelance/index.php"
+# Eingeloggt-Signale im HTML dieser Seite (wie in is_logged_in: Logout-Link, "Mein Profil").
+# Eine abgelaufene Session kann mit 200 ein Login-Formular oder eine Zwischenseite liefern.
+LOGGED_IN_MARKERS = re.compile(r"""href=["'][^"']*logout|>\s*(?:Logout|Mein Profil)\s*<""", re.IGNORECASE)
+
+# Nach Klick auf "Kontaktdaten anzeigen": Kontaktblock, der immer gerendert wird (Person wie in
+# DETAIL_FIELDS, auch ohne E-Mail). Auf den mailto-Link selbst wird nicht gewartet, Seiten ohne
+# E-Mail würden sonst jedes Mal den ganzen Timeout kosten.
+CONTACT_BLOCK_SELECTOR = "div.list-item-main span.h5, div.media-body div.col-md-6, a[href^='mailto:']"
+
+# Anzahl paralleler Browser-Pages für Listing-Seiten und Projekt-Details (1 = sequentiell auf self.page)
+DETAIL_WORKERS = 4
+
+# Projekte pro Listing-Seite (pageSize) und Link-Selektor der Projektkarten
+PAGE_SIZE = 100
+
+# XHR-Antworten, deren URL eines davon enthält, werden nach der Trefferzahl durchsucht
+SEARCH_API_HINTS = ("search", "projekt", "project")
+
+# "browser" = jede Detailseite im Browser rendern
+# "http"    = Detailseiten per requests + lxml holen, Browser nur als Fallback für unvollständige Seiten
+DETAIL_MODE = "browser"
+
+# Bilder, Fonts, Tracking und Cookiebot blockieren (utils/RequestPolicy.py).
+# False = nichts blockieren, aber Requests/Bytes pro Navigation weiter zählen.
+BLOCK_ASSETS = True
+
+# Bereits gescrapte Projekte (PATH_SEEN) werden übersprungen.
+# Mit einer Anzahl Tagen werden Projekte, deren letzter Scrape älter ist, erneut gescraped.
+REFRESH_AFTER_DAYS = None
+
+# Verzeichnis für das Archiv aller geladenen Listing- und Detailseiten (utils/PageArchive.py).
+# None = nichts archivieren
+ARCHIVE_DIR = None
 
 
 ####################################
 
 class FreelanceActions:
-    def __init__(self, headless: bool = True):
+    def __init__(
+            self,
+            headless: bool = True,
+            workers: int = DETAIL_WORKERS,
+            detail_mode: str = DETAIL_MODE,
+            block_assets: bool = BLOCK_ASSETS,
+            path_seen: str = PATH_SEEN,
+            refresh_after_days: int = REFRESH_AFTER_DAYS,
+            path_storage_state: str = PATH_STORAGE_STATE,
+            archive_dir: str = ARCHIVE_DIR,
+            base_url: str = BASE_URL,
+            ):
+        t0 = perf_counter()
+        self.headless = headless
+        self.path_storage_state = path_storage_state
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.detail_mode = detail_mode
+        self.pool_stats = []
+        self.path_stats = Counter()
+        self.timings = {}
+        self.startup_timings = {}
+        self._pool = None
+        self._http_fetcher = None
+        self.waiter = ReadinessWaiter()
+        self.request_policy = RequestPolicy(enabled=block_assets)
+        # path_seen=None schaltet den Index ab
+        self.seen = SeenProjectIndex(
+            path_seen,
+            refresh_after=timedelta(days=refresh_after_days) if refresh_after_days else None,
+        ) if path_seen else None
+        self.archive = PageArchive(archive_dir) if archive_dir else None
         self._pw = sync_playwright().start()
         self.browser = self._pw.chromium.launch_persistent_context(
             #user_data_dir=".profile_freelance",
@@ -29,11 +123,54 @@ class FreelanceActions:
             headless=headless,
             viewport={'width':1280, 'height':800}
         )
+        self.request_policy.install(self.browser)
+        self._restore_storage_state()
         self.page = self.browser.new_page()
+        self.startup_timings["browser_launch"] = perf_counter() - t0
+
+    def _restore_storage_state(self):
+        """
+        Übernimmt die Cookies aus dem gespeicherten storage_state, falls das Profil
+        (user_data_dir) selbst noch keine Session für freelance.de hat.
+        """
+        path = Path(self.path_storage_state) if self.path_storage_state else None
+        if not path or not path.exists() or self.browser.cookies(self.base_url):
+            return
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+            self.browser.add_cookies(state.get("cookies", []))
+        except Exception as e:
+            print("storage_state konnte nicht geladen werden:", e)
+
+    def _save_storage_state(self):
+        if not self.path_storage_state:
+            return
+        Path(self.path_storage_state).parent.mkdir(parents=True, exist_ok=True)
+        self.browser.storage_state(path=self.path_storage_state)
+
+    def has_valid_session(self) -> bool:
+        """
+        Günstiger Session-Check ohne Rendering: ein HTTP-Request mit den Cookies des Contexts
+        auf SESSION_CHECK_PATH. Ein Redirect (z.B. auf den Login) heißt: nicht eingeloggt, ebenso
+        eine Antwort ohne LOGGED_IN_MARKERS im Body (Login-Formular oder Zwischenseite mit 200).
+        Fällt auf is_logged_in zurück, wenn der Request selbst fehlschlägt.
+        """
+        if not self.browser.cookies(self.base_url):
+            return False
+        try:
+            response = self.browser.request.get(self.base_url + SESSION_CHECK_PATH, max_redirects=0, timeout=10000)
+        except Exception as e:
+            print("Session check per HTTP fehlgeschlagen:", e)
+            return self.is_logged_in()
+        return response.ok and "login" not in response.url and bool(LOGGED_IN_MARKERS.search(response.text()))
+
+    def print_startup_timings(self):
+        parts = ", ".join(f"{k} {v:.2f}s" for k, v in self.startup_timings.items())
+        print(f"Startup: {parts} (total {sum(self.startup_timings.values()):.2f}s)")
     
     def is_logged_in(self) -> bool:
         # Auf Startseite prüfen (schnell, stabil)
-        self.page.goto("https://www.freelance.de/", wait_until="domcontentloaded", timeout=60000)
+        self.page.goto(f"{self.base_url}/", wait_until="domcontentloaded", timeout=60000)
         # Cookie-Banner ggf. wegklicken
         try:
             self.accept_cookies(self.page)
@@ -53,6 +190,8 @@ class FreelanceActions:
         return False
 
     def accept_cookies(self, page):
+        if self.request_policy.blocks_cookie_banner():
+            return # Cookiebot wird gar nicht erst geladen
         try:
             # Warten bis der Button erscheint (Timeout nach 3 Sekunden)
             page.wait_for_selector("#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll", timeout=3000)
@@ -70,12 +209,15 @@ class FreelanceActions:
         Returns:
             True, wenn Interstitial erkannt und geschlossen wurde, sonst False.
         """
-        # 1) Schnell prüfen, ob das Checkbox-/Label-Element auftaucht
-        probe = self.page.locator('#no_postlogin_show_pa_default, label[for="no_postlogin_show_pa_default"]').first
+        # 1) Schnell prüfen, ob das Checkbox-/Label-Element auftaucht.
+        # Die Seite wird serverseitig ausgeliefert, nach goto ist sie also schon im DOM.
+        probe = page.locator('#no_postlogin_show_pa_default, label[for="no_postlogin_show_pa_default"]').first
+        if not probe.count():
+            return False  # keine Interstitial-Seite
         try:
             probe.wait_for(state="visible", timeout=timeout)
         except PlaywrightTimeoutError:
-            return False  # keine Interstitial-Seite
+            return False
         
         # 2) Häkchen setzen (über input.check oder Label-Klick)
         if page.locator('#no_postlogin_show_pa_default').count():
@@ -96,21 +238,69 @@ class FreelanceActions:
 
 
     def login(self) -> None:
-        if self.is_logged_in():
+        t0 = perf_counter()
+        logged_in = self.has_valid_session()
+        self.startup_timings["session_check"] = perf_counter() - t0
+        if logged_in:
             print("Bereits eingelogged")
+            self.print_startup_timings()
             return
-        self.page.goto("https://www.freelance.de/login.php")
+        t0 = perf_counter()
+        self.page.goto(f"{self.base_url}/login.php")
         self.accept_cookies(self.page) #cookie button
-        self.page.fill("#username", KeyVaultManager().get_secret('freelance-username'))
-        self.page.fill("#password", KeyVaultManager().get_secret('freelance-password'))
+        self.page.fill("#username", get_cached_secret('freelance-username'))
+        self.page.fill("#password", get_cached_secret('freelance-password'))
         self.page.click("input[type=submit]")
         self.page.wait_for_selector("h3:has-text('Mein Profil')") # Erfolgskriterium
+        self._save_storage_state()
+        self.startup_timings["login"] = perf_counter() - t0
         print("Login success.")
+        self.print_startup_timings()
     
-    def projects_urls(self, time_period: int) -> list:
+    def _listing_links(self, page: Page, url: str) -> list:
+        """
+        Lädt eine Listing-Seite und liest alle Projekt-Links in einem Round-Trip aus.
+        """
+        page.goto(url)
+        self.waiter.count_settled(page, "listing_cards", "search-project-card")
+        return self._card_links(page)
+
+    def _card_links(self, page: Page) -> list:
+        """
+        Projekt-Links aller Karten der geladenen Listing-Seite (utils/extractors.py, LISTING_FIELDS).
+        """
+        self._archive_page(page, "listing")
+        cards = page.evaluate(LISTING_CARDS_JS, [LISTING_CARD_XPATH, LISTING_FIELDS])
+        return [urljoin(page.url, c["url"]) for c in cards if c["url"]]
+
+    def _archive_page(self, page: Page, source: str):
+        """
+        Legt das aktuelle HTML der Page im PageArchive ab (nur mit archive_dir).
+        """
+        if self.archive is not None:
+            self.archive.put(page.url, page.content(), source)
+
+    def _total_hits(self, responses: list) -> int:
+        """
+        Gesamtzahl der Treffer: zuerst aus der JSON-Antwort der Such-API, sonst aus dem DOM.
+        Returns:
+            int oder None, wenn nichts gefunden wurde.
+        """
+        for response in responses:
+            try:
+                total = total_hits_from_json(response.json())
+            except Exception:
+                continue
+            if total is not None:
+                return total
+        return total_hits_from_texts(self.page.evaluate(TOTAL_HITS_TEXTS_JS))
+
+    def projects_urls(self, time_period: int, workers: int = None) -> list:
         """
         Returning all project Urls for selected time period as list. 
         day: 0 = today, 1 = yesterday, 7 = last 7 days 
+        Die Seitenzahl ergibt sich aus der Trefferzahl und PAGE_SIZE. Die restlichen Seiten
+        werden parallel über den PagePool geladen, Links werden beim Eintreffen dedupliziert.
         """
         if time_period == 0: 
             time_str = "D0--today"
@@ -119,114 +309,90 @@ class FreelanceActions:
         if time_period == 7: 
             time_str = "D7--past_7_days"
 
-        base_url = f"https://www.freelance.de/projekte?remotePreference=remote_remote--remote&lastUpdate={time_str}"
-        self.page.goto(f"{base_url}&page=1&pageSize=100") 
-        _ = self.maybe_dismiss_page(self.page)
-        sleep(2) # warten, damit die page items geladen sind    
-        self.page.wait_for_selector("search-project-card")
+        t0 = perf_counter()
+        listing_url = f"{self.base_url}/projekte?remotePreference=remote_remote--remote&lastUpdate={time_str}"
 
-        # How many pages of results are there
-        page_items_active = len(self.page.query_selector_all(".page-item"))
-        print(f"Page items active: {page_items_active}")
-        page_items_disabled = len(self.page.query_selector_all(".page-item.disabled"))
-        print(f"Page items disabled: {page_items_disabled}")
+        # JSON-Antworten der Such-API mitschneiden, ausgewertet wird erst nach dem Laden
+        api_responses = []
+        def collect(response):
+            if (response.request.resource_type in ("xhr", "fetch")
+                    and "json" in response.headers.get("content-type", "")
+                    and any(h in response.url for h in SEARCH_API_HINTS)):
+                api_responses.append(response)
 
-        
-        # Bei einem disabled Element gibt es nur mehrere Seiten, weil nur "vorherige" disabled ist
-        # Bei mehr als einem werden "nächste" und "vorherige" mitgezählt und müssen abgezogen werden
-        if page_items_disabled ==1:
-            pages = page_items_active - 2 
+        self.page.on("response", collect)
+        try:
+            self.page.goto(f"{listing_url}&page=1&pageSize={PAGE_SIZE}")
+            _ = self.maybe_dismiss_page(self.page)
+            # warten, bis die Karten (und damit die page items) vollständig geladen sind
+            self.waiter.count_settled(self.page, "listing_cards", "search-project-card")
+        finally:
+            self.page.remove_listener("response", collect)
+
+        all_links = []
+        seen = set()
+        def add(links):
+            for href in links or []:
+                if href not in seen:
+                    seen.add(href)
+                    all_links.append(href)
+
+        add(self._card_links(self.page))
+
+        total = self._total_hits(api_responses)
+        if total is not None and total >= len(all_links):
+            pages = max(1, ceil(total / PAGE_SIZE))
+            print(f"{total} projects in total")
         else:
-            pages = 1
+            # Fallback: Seitenzahl aus dem Paginator
+            page_items_active = self.page.locator(".page-item").count()
+            page_items_disabled = self.page.locator(".page-item.disabled").count()
+            # Bei einem disabled Element gibt es nur mehrere Seiten, weil nur "vorherige" disabled ist
+            # Bei mehr als einem werden "nächste" und "vorherige" mitgezählt und müssen abgezogen werden
+            if page_items_disabled ==1:
+                pages = page_items_active - 2 
+            else:
+                pages = 1
         print(f"{pages} pages of new infos")
 
-        all_links = []
+        urls = [f"{listing_url}&page={page}&pageSize={PAGE_SIZE}" for page in range(2, pages+1)]
+        workers = self.workers if workers is None else workers
+        if workers > 1 and len(urls) > 1:
+            self._get_pool(workers).map(self._listing_links, urls, on_result=lambda idx, links: add(links))
+        else:
+            for url in urls:
+                print (f"Scanning {url}")
+                add(self._listing_links(self.page, url))
 
-        for page in range(1, pages+1):
-            print (f"Scanning Page {page}")
-            # Ggf nochmal die Seite laden
-            self.page.goto(
-                f"{base_url}&page={page}&pageSize=100")
-            sleep(2) # warten, damit alle cards geladen sind
-            # Alle Karten selektieren
-            cards = self.page.query_selector_all("search-project-card")
-        
-            for card in cards:
-                # Innerhalb jeder Karte nach dem gewünschten Link suchen
-                href = card.get_attribute("href")
-                link = card.query_selector("a.small.fw-semibold.link-warning")
-                if link:
-                    href = link.get_attribute("href")
-                    if href and href != "":
-                        all_links.append(href)
-
-        print(f"Received {len(all_links)} links.")
+        self.timings["listing"] = perf_counter() - t0
+        print(f"Received {len(all_links)} links in {self.timings['listing']:.1f}s.")
         return all_links
        
-    def projects_intel(self, url: str) ->list:
+    def projects_intel(self, url: str, page: Page = None) ->list:
         """
         Returning a list with:
+        - url, project name, project description
         - Agency Name
         - contact person
         - contact email
+        page: Page, auf der gescraped wird (default: self.page, im Pool die Page des Workers)
+
+        Alle Felder (inkl. der Fallbacks "Variante 1/2") kommen aus DETAIL_FIELDS in
+        utils/extractors.py und werden in einem einzigen page.evaluate ausgelesen.
+        Fehlende Felder sind "".
         """
+        page = page or self.page
         try:
-            self.page.goto(url)
-            _ = self.maybe_dismiss_page(self.page)
+            page.goto(url)
+            _ = self.maybe_dismiss_page(page)
         
-            self.page.get_by_text("Kontaktdaten anzeigen").click(timeout=2000.0)
-            sleep(0.5)
-
-            ### Company ###
-            project_header = self.page.locator("div.project-header")
-            company_el = project_header.locator("a[onclick^='window.open']").first
-            if company_el.count():
-                company = (company_el.inner_text() or "")
-            
-            ### Name ###
-            ### Variante 1
-            full_block = self.page.locator("div.list-item-main").first
-            name_el = full_block.locator("span[class='h5']").first
-            if name_el.count():
-                name = (name_el.inner_text() or "")
-
-            ### Variante 2
-            if not name:
-                full_block = self.page.locator("div.media-body").first
-                name_el = full_block.locator("div[class='col-md-6']").first
-                if name_el.count():
-                    name = (name_el.inner_text().split("\n")[0] or "")
-
-
-            ### Email ###
-            ### Variante 1:
-            mail_block = self.page.locator("div.col-sm-6.margin-bottom-sm:has-text('E-Mail')").first
-            mail_el = mail_block.locator("a[href^='mailto:']").first
-            if mail_el.count(): # Prüft, ob Elemente existieren, gibt eigentliche die Anzahl zurück
-                email = (mail_el.inner_text() or "").strip()
-
-            ### Variante 2:
-            if not email:
-                mail_block = self.page.locator("div.col-md-6:has-text('@')").first
-                mail_el = mail_block.locator("a[href^='mailto:']").first
-                if mail_el.count(): # Prüft, ob Elemente existieren, gibt eigentliche die Anzahl zurück
-                    email = (mail_el.inner_text() or "").strip()
-            
-            ### Project Name
-            prname_block = self.page.locator("div.highlight-text").first
-            name_el = prname_block.locator('h1[class="margin-bottom-xs"]').first
-            if name_el.count():
-                project_name = (name_el.inner_text() or "").strip()
-
-            ### Project Text ###
-            #prdesc_block = self.page.locator("div.panel.panel-default.panel-white").first
-            #prdesc_block.wait_for(state = "attached", timeout=3000)
-
-            # Textbox one ::before finden
-            desc_el = self.page.locator('div.panel-body.highlight-text').first
-            project_description = (desc_el.text_content() or "").strip()
-
-            return [url, project_name, project_description, company, name, email]
+            page.get_by_text("Kontaktdaten anzeigen").click(timeout=2000.0)
+            # warten, bis der nachgeladene Kontaktblock im DOM hängt
+            self.waiter.selector(page, "contact_block", CONTACT_BLOCK_SELECTOR)
+
+            fields = page.evaluate(DETAIL_FIELDS_JS, DETAIL_FIELDS)
+            self._archive_page(page, "detail")
+            return [url] + [fields.get(c, "") for c in INTEL_COLS[1:]]
         
         except PlaywrightTimeoutError:
             return None
@@ -234,18 +400,64 @@ class FreelanceActions:
             print("projects_intel error:", e)
             return None
         
-    def new_projects_intel(self, time_period, path_new_raw_full = PATH_NEW_RAW, path_new_agencies = PATH_NEW_AGENCIES):
-        import pandas as pd
+    def new_projects_intel(self, time_period, path_new_raw_full = PATH_NEW_RAW, path_new_agencies = PATH_NEW_AGENCIES, workers: int = None, path_checkpoint = PATH_CHECKPOINT):
+        """
+        Scraped alle Projekte des Zeitraums und exportiert sie.
+        workers: Anzahl paralleler Pages (default: self.workers). Bei mehr als einem Worker
+        werden die Details über einen PagePool geholt, die Reihenfolge bleibt erhalten.
+        Projekte, die laut self.seen schon in einem früheren Lauf gescraped wurden, werden übersprungen.
+
+        Jede Zeile wird an path_checkpoint (JSONL) angehängt, sobald ihr Projekt gescraped ist
+        (über on_result, die Worker laufen dabei ohne Pause weiter). Bricht ein Lauf ab, setzt der nächste dort fort. Erst am Ende werden die Excel-Dateien
+        geschrieben und der Checkpoint gelöscht.
+        """
         from freelanceBot.freelance_agents_excel import agents_excel
-        # Liste an Links kreieren
-        all_links = self.projects_urls(time_period)
+        sink = CheckpointSink(path_checkpoint, INTEL_COLS)
+        done = sink.done_urls()
+        if done:
+            print(f"Resuming from checkpoint with {len(done)} projects.")
 
-        cols = ["url", "project_name", "project_description", "company", "person", "email"]
-        df = pd.DataFrame(columns = cols)
-        for url in all_links:
-            intel = self.projects_intel(url)
+        # Liste an Links kreieren
+        workers = self.workers if workers is None else workers
+        all_links = [url for url in self.projects_urls(time_period, workers) if url not in done]
+        if self.seen is not None:
+            before = len(all_links)
+            all_links = [url for url in all_links if self.seen.needs_scrape(url)]
+            print(f"{before - len(all_links)} projects already scraped, {len(all_links)} left.")
+
+        finished = 0
+
+        def on_result(idx, intel):
+            nonlocal finished
+            finished += 1
             if intel:
-                df.loc[len(df)]=intel
+                sink.write(intel)
+                if self.seen is not None:
+                    self.seen.add(intel[0], intel[1:])
+            if finished % PROGRESS_EVERY == 0 or finished == len(all_links):
+                print(f"{finished}/{len(all_links)} projects done.")
+
+        t0 = perf_counter()
+        try:
+            if self.detail_mode == "http":
+                self.projects_intel_http(all_links, workers, on_result=on_result)
+            else:
+                self.projects_intel_browser(all_links, workers, on_result=on_result)
+        finally:
+            self._close_pool()
+            self._close_http_fetcher()
+            sink.close()
+        self.timings["detail"] = perf_counter() - t0
+        print(f"Listing phase {self.timings.get('listing', 0):.1f}s, "
+              f"detail phase {self.timings['detail']:.1f}s for {len(all_links)} projects.")
+        if self.seen is not None:
+            self.seen.compact()
+        if self.detail_mode == "http":
+            self.print_path_stats()
+        self.waiter.print_summary()
+        self.request_policy.print_summary()
+
+        df = sink.to_dataframe()
 
         # export full dataset
         agents_excel(df, path_new_raw_full)
@@ -253,9 +465,112 @@ class FreelanceActions:
         # export only agents data
         df2 = df.drop(columns=["url", "project_name", "project_description"])
         agents_excel(df2, path_new_agencies)
-        
+
+        sink.remove()
         return df
     
+    def projects_intel_browser(self, urls: list, workers: int, on_result=None) -> list:
+        """
+        Holt projects_intel für alle urls im Browser, parallel über den PagePool bei mehr als einem Worker.
+        on_result(idx, intel) wird aufgerufen, sobald ein Projekt fertig ist.
+        """
+        if workers > 1 and len(urls) > 1:
+            return self.projects_intel_parallel(urls, workers, on_result)
+        intels = []
+        for idx, url in enumerate(urls):
+            intels.append(self.projects_intel(url))
+            if on_result:
+                on_result(idx, intels[-1])
+        return intels
+
+    def projects_intel_http(self, urls: list, workers: int, on_result=None) -> list:
+        """
+        Fast Path ohne Rendering: holt die Detailseiten mit den Cookies des eingeloggten Contexts
+        per HTTP und parst sie mit lxml. Nur Seiten, deren Felder unvollständig sind, werden
+        anschließend im Browser gescraped. Die Trefferquote pro Pfad landet in self.path_stats.
+        on_result(idx, intel) wird aufgerufen, sobald ein Projekt fertig ist (HTTP oder Fallback).
+        """
+        intels = [None] * len(urls)
+        fallback = []
+
+        def on_http_result(i, fields):
+            if not is_complete(fields):
+                fallback.append(i)
+                return
+            intels[i] = [urls[i]] + [fields[c] for c in INTEL_COLS[1:]]
+            self.path_stats["http"] += 1
+            if on_result:
+                on_result(i, intels[i])
+
+        self._get_http_fetcher().map(urls, on_result=on_http_result)
+
+        if fallback:
+            fallback.sort()
+
+            def on_browser_result(j, intel):
+                i = fallback[j]
+                intels[i] = intel
+                self.path_stats["browser" if intel else "failed"] += 1
+                if on_result:
+                    on_result(i, intel)
+
+            self.projects_intel_browser([urls[i] for i in fallback], workers, on_result=on_browser_result)
+        return intels
+
+    def _get_http_fetcher(self) -> HttpDetailFetcher:
+        """
+        HttpDetailFetcher mit den Cookies und dem User-Agent des eingeloggten Contexts, wird wiederverwendet.
+        """
+        if self._http_fetcher is None:
+            self._http_fetcher = HttpDetailFetcher(
+                self.browser.cookies(),
+                user_agent=self.page.evaluate("navigator.userAgent"),
+                archive=self.archive,
+            )
+        return self._http_fetcher
+
+    def _close_http_fetcher(self):
+        if self._http_fetcher is not None:
+            self._http_fetcher.close()
+            self._http_fetcher = None
+
+    def print_path_stats(self):
+        stats = self.path_stats
+        total = sum(stats.values()) or 1
+        print(f"Detail paths: http {stats['http']} ({stats['http'] / total:.0%}), "
+              f"browser {stats['browser']} ({stats['browser'] / total:.0%}), "
+              f"failed {stats['failed']}")
+
+    def projects_intel_parallel(self, urls: list, workers: int, on_result=None) -> list:
+        """
+        Holt projects_intel für alle urls mit einem Pool aus `workers` Pages.
+        Die Pages teilen sich die Login-Session über den storage_state des persistent Contexts.
+        Gibt die Ergebnisse in der Reihenfolge der urls zurück, der Durchsatz pro Worker landet
+        beim Schließen des Pools in self.pool_stats. on_result(idx, intel) siehe PagePool.map.
+        """
+        return self._get_pool(workers).map(lambda page, url: self.projects_intel(url, page), urls, on_result=on_result)
+
+    def _get_pool(self, workers: int) -> PagePool:
+        """
+        PagePool für Listing- und Detailphase. Wird einmal gestartet und wiederverwendet.
+        """
+        if self._pool is None:
+            self._pool = PagePool(
+                self.browser.storage_state(),
+                workers=workers,
+                headless=self.headless,
+                setup_context=self.request_policy.install,
+            )
+        return self._pool
+
+    def _close_pool(self):
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.print_stats()
+        self.pool_stats = self._pool.stats
+        self._pool = None
+
     def project_name_simple(self, project_url: str):
         return project_url.split("/")[-1].replace("-", " ")
     
@@ -271,8 +586,11 @@ class FreelanceActions:
         return project_name
 
     def close(self):
+        self._close_pool()
         self.browser.close()
         self._pw.stop()
+        if self.archive is not None:
+            self.archive.close()
     
     def scrape_freelance(self, time_period) -> pd.DataFrame:
         """
@@ -287,11 +605,21 @@ class FreelanceActions:
 
         self.login()
         agency_list = self.new_projects_intel(time_period)
-        self.close
+        self.close()
         return agency_list
 
-def main(time_period, headless = False):
-    fc = FreelanceActions(headless)
+def main(time_period, headless = False, workers = DETAIL_WORKERS, detail_mode = DETAIL_MODE, refresh_after_days = REFRESH_AFTER_DAYS, mode = "sync", archive_dir = ARCHIVE_DIR):
+    """
+    mode: "sync" = FreelanceActions, "async" = AsyncFreelanceActions (freelance_actions_async.py)
+    Die async-Variante rendert Detailseiten immer im Browser, detail_mode="http" gibt es nur für "sync".
+    """
+    if mode == "async":
+        if detail_mode != "browser":
+            raise ValueError(f"detail_mode={detail_mode!r} wird mit mode='async' nicht unterstützt (nur 'browser').")
+        from freelanceBot.freelance_actions_async import main as main_async
+        return main_async(time_period, headless, workers, refresh_after_days, archive_dir)
+
+    fc = FreelanceActions(headless, workers, detail_mode, refresh_after_days=refresh_after_days, archive_dir=archive_dir)
 
     # test_url = r'https://www.freelance.de/projekte/projekt-1236689-SAP-Manager-SF-HCM-m-w-d'
     # print (fc.projects_intel(test_url))
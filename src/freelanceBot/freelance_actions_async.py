@@ -0,0 +1,409 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
+from utils.KVManager import get_cached_secret
+from utils.Waiter import ReadinessWaiter
+from utils.RequestPolicy import RequestPolicy
+from utils.SeenIndex import SeenProjectIndex
+from utils.CheckpointSink import CheckpointSink
+from utils.PageArchive import PageArchive
+from urllib.parse import urljoin
+from utils.extractors import (
+    DETAIL_FIELDS, DETAIL_FIELDS_JS, LISTING_CARD_XPATH, LISTING_CARDS_JS, LISTING_FIELDS, TOTAL_HITS_TEXTS_JS,
+    total_hits_from_json, total_hits_from_texts,
+)
+from freelanceBot.freelance_actions import (
+    PATH_NEW_RAW, PATH_NEW_AGENCIES, PATH_SEEN, INTEL_COLS,
+    DETAIL_WORKERS, BLOCK_ASSETS, REFRESH_AFTER_DAYS,
+    PAGE_SIZE, SEARCH_API_HINTS,
+    PATH_STORAGE_STATE, BASE_URL, SESSION_CHECK_PATH, LOGGED_IN_MARKERS, PATH_CHECKPOINT, ARCHIVE_DIR, CONTACT_BLOCK_SELECTOR,
+)
+from datetime import timedelta
+from math import ceil
+from pathlib import Path
+import json
+from time import perf_counter
+import asyncio
+import re
+import pandas as pd
+
+
+class AsyncFreelanceActions:
+    """
+    asyncio-Variante von FreelanceActions auf Basis von playwright.async_api.
+    Gleiche Oberfläche (login, projects_urls, projects_intel, new_projects_intel, close),
+    aber alle Methoden sind Coroutinen. Seitenaufrufe laufen parallel auf mehreren Pages
+    desselben persistent Contexts, begrenzt durch einen Semaphore (workers).
+
+    Da alles in einem Event-Loop läuft, lässt sich das Scraping mit anderen async-Arbeiten
+    überlappen, z.B.:
+        fc = await AsyncFreelanceActions.create(headless=True)
+        df, mail = await asyncio.gather(
+            fc.scrape_freelance(1),
+            find_email_on_website_async("example.com", EMAIL_PARTS_DEFAULT),
+        )
+    """
+    def __init__(
+            self,
+            headless: bool = True,
+            workers: int = DETAIL_WORKERS,
+            block_assets: bool = BLOCK_ASSETS,
+            path_seen: str = PATH_SEEN,
+            refresh_after_days: int = REFRESH_AFTER_DAYS,
+            path_storage_state: str = PATH_STORAGE_STATE,
+            archive_dir: str = ARCHIVE_DIR,
+            base_url: str = BASE_URL,
+            ):
+        self.headless = headless
+        self.path_storage_state = path_storage_state
+        self.base_url = base_url.rstrip("/")
+        self.workers = max(1, workers)
+        self.waiter = ReadinessWaiter()
+        self.request_policy = RequestPolicy(enabled=block_assets)
+        self.seen = SeenProjectIndex(
+            path_seen,
+            refresh_after=timedelta(days=refresh_after_days) if refresh_after_days else None,
+        ) if path_seen else None
+        self.archive = PageArchive(archive_dir) if archive_dir else None
+        self._pw = None
+        self.browser = None
+        self.page = None
+        self._sem = None
+        self._idle_pages = []
+        self.timings = {}
+        self.startup_timings = {}
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "AsyncFreelanceActions":
+        """
+        Erzeugt die Instanz und startet den Browser.
+        """
+        fc = cls(*args, **kwargs)
+        await fc.start()
+        return fc
+
+    async def start(self):
+        t0 = perf_counter()
+        self._pw = await async_playwright().start()
+        self.browser = await self._pw.chromium.launch_persistent_context(
+            user_data_dir=".profile_freelance2",
+            headless=self.headless,
+            viewport={'width':1280, 'height':800}
+        )
+        await self.request_policy.install_async(self.browser)
+        await self._restore_storage_state()
+        self.page = await self.browser.new_page()
+        self._sem = asyncio.Semaphore(self.workers)
+        self.startup_timings["browser_launch"] = perf_counter() - t0
+
+    async def _restore_storage_state(self):
+        path = Path(self.path_storage_state) if self.path_storage_state else None
+        if not path or not path.exists() or await self.browser.cookies(self.base_url):
+            return
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+            await self.browser.add_cookies(state.get("cookies", []))
+        except Exception as e:
+            print("storage_state konnte nicht geladen werden:", e)
+
+    async def _save_storage_state(self):
+        if not self.path_storage_state:
+            return
+        Path(self.path_storage_state).parent.mkdir(parents=True, exist_ok=True)
+        await self.browser.storage_state(path=self.path_storage_state)
+
+    async def has_valid_session(self) -> bool:
+        """
+        Siehe FreelanceActions.has_valid_session.
+        """
+        if not await self.browser.cookies(self.base_url):
+            return False
+        try:
+            response = await self.browser.request.get(self.base_url + SESSION_CHECK_PATH, max_redirects=0, timeout=10000)
+        except Exception as e:
+            print("Session check per HTTP fehlgeschlagen:", e)
+            return await self.is_logged_in()
+        if not response.ok or "login" in response.url:
+            return False
+        return bool(LOGGED_IN_MARKERS.search(await response.text()))
+
+    def print_startup_timings(self):
+        parts = ", ".join(f"{k} {v:.2f}s" for k, v in self.startup_timings.items())
+        print(f"Startup: {parts} (total {sum(self.startup_timings.values()):.2f}s)")
+
+    async def _with_page(self, func, *args):
+        """
+        Führt func(page, *args) auf einer freien Page aus. Höchstens self.workers gleichzeitig,
+        Pages werden wiederverwendet.
+        """
+        async with self._sem:
+            page = self._idle_pages.pop() if self._idle_pages else await self.browser.new_page()
+            try:
+                return await func(page, *args)
+            finally:
+                self._idle_pages.append(page)
+
+    async def is_logged_in(self) -> bool:
+        await self.page.goto(f"{self.base_url}/", wait_until="domcontentloaded", timeout=60000)
+        try:
+            await self.accept_cookies(self.page)
+        except Exception:
+            pass
+
+        selectors = [
+            "h3:has-text('Mein Profil')",
+            "a[href*='logout']",
+            "a:has-text('Logout')",
+            "a:has-text('Mein Profil')",
+        ]
+        for sel in selectors:
+            if await self.page.locator(sel).first.count() > 0:
+                return True
+        return False
+
+    async def accept_cookies(self, page: Page):
+        if self.request_policy.blocks_cookie_banner():
+            return
+        try:
+            await page.wait_for_selector("#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll", timeout=3000)
+            await page.click("#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll")
+            print("Cookie Consent akzeptiert.")
+        except Exception:
+            print("Kein Cookie Consent gefunden – geht weiter.")
+
+    async def maybe_dismiss_page(self, page: Page, timeout: int = 1500) -> bool:
+        """
+        Siehe FreelanceActions.maybe_dismiss_page.
+        """
+        probe = page.locator('#no_postlogin_show_pa_default, label[for="no_postlogin_show_pa_default"]').first
+        if not await probe.count():
+            return False
+        try:
+            await probe.wait_for(state="visible", timeout=timeout)
+        except PlaywrightTimeoutError:
+            return False
+
+        if await page.locator('#no_postlogin_show_pa_default').count():
+            await page.check('#no_postlogin_show_pa_default', force=True)
+        else:
+            await page.click('label[for="no_postlogin_show_pa_default"]', force=True)
+
+        try:
+            await page.get_by_role("link", name=re.compile(r"Weiter.*vorherigen Seite", re.I)).click(timeout=3000)
+        except PlaywrightTimeoutError:
+            await page.locator('a.btn.btn-default').first.click()
+
+        await page.wait_for_load_state("domcontentloaded")
+        return True
+
+    async def login(self) -> None:
+        t0 = perf_counter()
+        logged_in = await self.has_valid_session()
+        self.startup_timings["session_check"] = perf_counter() - t0
+        if logged_in:
+            print("Bereits eingelogged")
+            self.print_startup_timings()
+            return
+        t0 = perf_counter()
+        # Key Vault ist synchron, deshalb im Thread, damit der Event-Loop frei bleibt
+        username, password = await asyncio.gather(
+            asyncio.to_thread(get_cached_secret, 'freelance-username'),
+            asyncio.to_thread(get_cached_secret, 'freelance-password'),
+        )
+        await self.page.goto(f"{self.base_url}/login.php")
+        await self.accept_cookies(self.page)
+        await self.page.fill("#username", username)
+        await self.page.fill("#password", password)
+        await self.page.click("input[type=submit]")
+        await self.page.wait_for_selector("h3:has-text('Mein Profil')")
+        await self._save_storage_state()
+        self.startup_timings["login"] = perf_counter() - t0
+        print("Login success.")
+        self.print_startup_timings()
+
+    async def _listing_links(self, page: Page, url: str) -> list:
+        """
+        Fehler werden pro Listing-Seite abgefangen (wie im PagePool), damit eine Seite nicht den ganzen Lauf abbricht.
+        """
+        try:
+            await page.goto(url)
+            await self.waiter.count_settled_async(page, "listing_cards", "search-project-card")
+            return await self._card_links(page)
+        except Exception as e:
+            print("listing error:", url, e)
+            return []
+
+    async def _card_links(self, page: Page) -> list:
+        await self._archive_page(page, "listing")
+        cards = await page.evaluate(LISTING_CARDS_JS, [LISTING_CARD_XPATH, LISTING_FIELDS])
+        return [urljoin(page.url, c["url"]) for c in cards if c["url"]]
+
+    async def _archive_page(self, page: Page, source: str):
+        if self.archive is not None:
+            # gzip + SQLite blockieren, also nicht im Event-Loop
+            await asyncio.to_thread(self.archive.put, page.url, await page.content(), source)
+
+    async def _total_hits(self, responses: list) -> int:
+        """
+        Siehe FreelanceActions._total_hits.
+        """
+        for response in responses:
+            try:
+                total = total_hits_from_json(await response.json())
+            except Exception:
+                continue
+            if total is not None:
+                return total
+        return total_hits_from_texts(await self.page.evaluate(TOTAL_HITS_TEXTS_JS))
+
+    async def projects_urls(self, time_period: int) -> list:
+        """
+        Returning all project Urls for selected time period as list.
+        day: 0 = today, 1 = yesterday, 7 = last 7 days
+        Seitenzahl aus Trefferzahl und PAGE_SIZE, die Seiten ab Seite 2 werden parallel geladen
+        und die Links beim Eintreffen dedupliziert.
+        """
+        time_str = {0: "D0--today", 1: "D1--yesterday", 7: "D7--past_7_days"}[time_period]
+        t0 = perf_counter()
+        listing_url = f"{self.base_url}/projekte?remotePreference=remote_remote--remote&lastUpdate={time_str}"
+
+        api_responses = []
+        def collect(response):
+            if (response.request.resource_type in ("xhr", "fetch")
+                    and "json" in response.headers.get("content-type", "")
+                    and any(h in response.url for h in SEARCH_API_HINTS)):
+                api_responses.append(response)
+
+        self.page.on("response", collect)
+        try:
+            await self.page.goto(f"{listing_url}&page=1&pageSize={PAGE_SIZE}")
+            await self.maybe_dismiss_page(self.page)
+            await self.waiter.count_settled_async(self.page, "listing_cards", "search-project-card")
+        finally:
+            self.page.remove_listener("response", collect)
+
+        all_links = []
+        seen = set()
+        def add(links):
+            for href in links or []:
+                if href and href not in seen:
+                    seen.add(href)
+                    all_links.append(href)
+
+        add(await self._card_links(self.page))
+
+        total = await self._total_hits(api_responses)
+        if total is not None and total >= len(all_links):
+            pages = max(1, ceil(total / PAGE_SIZE))
+        else:
+            page_items_active = await self.page.locator(".page-item").count()
+            page_items_disabled = await self.page.locator(".page-item.disabled").count()
+            pages = page_items_active - 2 if page_items_disabled == 1 else 1
+        print(f"{pages} pages of new infos")
+
+        tasks = [
+            asyncio.create_task(self._with_page(self._listing_links, f"{listing_url}&page={p}&pageSize={PAGE_SIZE}"))
+            for p in range(2, pages + 1)
+        ]
+        for task in asyncio.as_completed(tasks):
+            add(await task)
+
+        self.timings["listing"] = perf_counter() - t0
+        print(f"Received {len(all_links)} links in {self.timings['listing']:.1f}s.")
+        return all_links
+
+    async def _projects_intel_on_page(self, page: Page, url: str) -> list:
+        try:
+            await page.goto(url)
+            await self.maybe_dismiss_page(page)
+            await page.get_by_text("Kontaktdaten anzeigen").click(timeout=2000.0)
+            await self.waiter.selector_async(page, "contact_block", CONTACT_BLOCK_SELECTOR)
+            # Alle Felder in einem Round-Trip (siehe FreelanceActions.projects_intel)
+            fields = await page.evaluate(DETAIL_FIELDS_JS, DETAIL_FIELDS)
+            await self._archive_page(page, "detail")
+            return [url] + [fields.get(c, "") for c in INTEL_COLS[1:]]
+        except PlaywrightTimeoutError:
+            return None
+        except Exception as e:
+            print("projects_intel error:", e)
+            return None
+
+    async def projects_intel(self, url: str) -> list:
+        """
+        Returning a list with url, project name, description, agency name, contact person and email.
+        """
+        return await self._with_page(self._projects_intel_on_page, url)
+
+    async def new_projects_intel(self, time_period, path_new_raw_full = PATH_NEW_RAW, path_new_agencies = PATH_NEW_AGENCIES, path_checkpoint = PATH_CHECKPOINT) -> pd.DataFrame:
+        """
+        Wie FreelanceActions.new_projects_intel, die Detailseiten laufen parallel (self.workers).
+        Jede Zeile wird direkt nach dem Scrapen in den Checkpoint geschrieben.
+        """
+        from freelanceBot.freelance_agents_excel import agents_excel
+        sink = CheckpointSink(path_checkpoint, INTEL_COLS)
+        done = sink.done_urls()
+        if done:
+            print(f"Resuming from checkpoint with {len(done)} projects.")
+
+        all_links = [url for url in await self.projects_urls(time_period) if url not in done]
+        if self.seen is not None:
+            before = len(all_links)
+            all_links = [url for url in all_links if self.seen.needs_scrape(url)]
+            print(f"{before - len(all_links)} projects already scraped, {len(all_links)} left.")
+
+        t0 = perf_counter()
+        tasks = [asyncio.create_task(self.projects_intel(url)) for url in all_links]
+        try:
+            for task in asyncio.as_completed(tasks):
+                intel = await task
+                if not intel:
+                    continue
+                sink.write(intel)
+                if self.seen is not None:
+                    self.seen.add(intel[0], intel[1:])
+        finally:
+            for task in tasks:
+                task.cancel()
+            sink.close()
+        self.timings["detail"] = perf_counter() - t0
+        print(f"Listing phase {self.timings.get('listing', 0):.1f}s, "
+              f"detail phase {self.timings['detail']:.1f}s for {len(all_links)} projects.")
+        if self.seen is not None:
+            self.seen.compact()
+        self.waiter.print_summary()
+        self.request_policy.print_summary()
+
+        df = sink.to_dataframe()
+        agents_excel(df, path_new_raw_full)
+        df2 = df.drop(columns=["url", "project_name", "project_description"])
+        agents_excel(df2, path_new_agencies)
+        sink.remove()
+        return df
+
+    async def close(self):
+        await self.browser.close()
+        await self._pw.stop()
+        if self.archive is not None:
+            self.archive.close()
+
+    async def scrape_freelance(self, time_period) -> pd.DataFrame:
+        """
+        Login, new_projects_intel, close. Returns full dataset as dataframe.
+        """
+        try:
+            await self.login()
+            return await self.new_projects_intel(time_period)
+        finally:
+            await self.close()
+
+
+async def main_async(time_period, headless = False, workers = DETAIL_WORKERS, refresh_after_days = REFRESH_AFTER_DAYS, archive_dir = ARCHIVE_DIR):
+    fc = await AsyncFreelanceActions.create(headless, workers, refresh_after_days=refresh_after_days, archive_dir=archive_dir)
+    return await fc.scrape_freelance(time_period)
+
+def main(time_period, headless = False, workers = DETAIL_WORKERS, refresh_after_days = REFRESH_AFTER_DAYS, archive_dir = ARCHIVE_DIR):
+    return asyncio.run(main_async(time_period, headless, workers, refresh_after_days, archive_dir))
+
+if __name__ == "__main__":
+    main(1)
@@ -4,9 +4,9 @@ from freelanceBot.freelance_agencies import main as freelance_agencies
 from freelanceBot.send_email import main as send_agency_mail
 
 
-def main(time_period, headless = False, mail_freelance_agencies = False,):
-    # Scrape freelance for given time period
-    freelance_actions(time_period=time_period, headless = headless)
+def main(time_period, headless = False, mail_freelance_agencies = False, mode = "sync"):
+    # Scrape freelance for given time period (mode: "sync" oder "async")
+    freelance_actions(time_period=time_period, headless = headless, mode = mode)
     # Prepare Project Lists for the day
     freelance_projects()
     # Prepare Agencies Lists for the day
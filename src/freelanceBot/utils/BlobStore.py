@@ -0,0 +1,457 @@
+from pathlib import Path
+import io
+import os
+import threading
+
+# Azure verträgt höchstens 4 MiB pro append_block
+APPEND_BLOCK_BYTES = 4 * 1024 * 1024
+# Lesepuffer von open(): so viele Bytes holt ein Range-Request mindestens
+READ_BUFFER_BYTES = 4 * 1024 * 1024
+
+# Auswahl des Speichers (default_store), von utils/DefaultTable und scrapeNewEntries genutzt.
+# Lokal z.B. gegen Azurite: FBLIST_CONNECTION_STRING=UseDevelopmentStorage=true
+CONNECTION_STRING_ENV = "FBLIST_CONNECTION_STRING"
+CONNECTION_STRING_SECRET = "conn-str-safreelancebotprod"
+# "azure" = Blob Storage, "local" = Blobs als Dateien, "sqlite" = SQLite-Datenbank mit Upserts pro Zeile.
+# Ohne Angabe: local, wenn FBLIST_LOCAL_DIR gesetzt ist, sonst azure
+BACKEND_ENV = "FBLIST_BACKEND"
+# Verzeichnis für local und sqlite (lokale Läufe, Tests)
+LOCAL_DIR_ENV = "FBLIST_LOCAL_DIR"
+LOCAL_DIR_DEFAULT = "fblist_data"
+# lokaler Read-through-Cache der Blobs (per ETag geprüft), Default für azure: <tempdir>/fblist_cache,
+# für local nur, wenn gesetzt. "off" schaltet ihn ab
+CACHE_DIR_ENV = "FBLIST_CACHE_DIR"
+
+
+class BlobChanged(Exception):
+    """
+    Bedingter Upload/Lesevorgang fehlgeschlagen: der Blob wurde von jemand anderem geändert
+    (ETag passt nicht mehr) bzw. existiert bei if_none_match schon.
+    """
+
+
+class _BlobReader(io.RawIOBase):
+    """
+    Seekbarer Lesestream über Byte-Ranges (read_range(offset, length) -> bytes).
+    Parser lesen direkt daraus, ohne dass der ganze Blob vorher als bytes/str im Speicher liegt;
+    Parquet holt so nur Footer und die gewünschten Spalten.
+    etag: Version des Blobs, die gelesen wird (über stream.raw.etag erreichbar).
+    store=None: Lesen aus dem lokalen Cache, zählt nicht als Download.
+    """
+    def __init__(self, store, read_range, size: int, etag: str, on_close=None):
+        self._store         = store
+        self._read_range    = read_range
+        self._size          = size
+        self._pos           = 0
+        self._on_close      = on_close
+        self.etag           = etag
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        n = min(len(buffer), self._size - self._pos)
+        if n <= 0:
+            return 0
+        data = self._read_range(self._pos, n)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        if self._store is not None:
+            self._store.bytes_downloaded += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed and self._on_close:
+            self._on_close()
+        super().close()
+
+
+class AzureBlobStore:
+    """
+    Blobs in einem Container eines Azure Storage Accounts (oder Azurite mit UseDevelopmentStorage=true).
+    Das Azure SDK wird erst beim ersten Zugriff importiert. connection_string darf ein Callable sein,
+    das erst dann aufgerufen wird (z.B. Key Vault).
+    """
+    def __init__(self, connection_string: str, container_name: str):
+        self.connection_string  = connection_string
+        self.container_name     = container_name
+        self.bytes_downloaded   = 0
+        self._service           = None
+
+    def _blob(self, name: str):
+        if self._service is None:
+            from azure.storage.blob import BlobServiceClient
+            if callable(self.connection_string):
+                self.connection_string = self.connection_string()
+            self._service = BlobServiceClient.from_connection_string(self.connection_string)
+        return self._service.get_blob_client(container=self.container_name, blob=name)
+
+    def _create_container(self):
+        from azure.core.exceptions import ResourceExistsError
+        try:
+            self._service.create_container(self.container_name)
+        except ResourceExistsError:
+            pass
+
+    def download(self, name: str):
+        """
+        Returns:
+            bytes oder None, wenn der Blob nicht existiert.
+        """
+        return self.download_versioned(name)[0]
+
+    def download_versioned(self, name: str, if_none_match: str = None) -> tuple:
+        """
+        if_none_match: ETag einer schon vorhandenen Kopie, der Blob wird nur übertragen,
+            wenn er sich seitdem geändert hat (bedingter GET, sonst 304 ohne Body).
+        Returns:
+            (bytes, etag), (None, if_none_match) wenn unverändert, (None, None) wenn der Blob nicht existiert.
+        """
+        from azure.core import MatchConditions
+        from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+        kwargs = {"etag": if_none_match, "match_condition": MatchConditions.IfModified} if if_none_match else {}
+        try:
+            downloader = self._blob(name).download_blob(**kwargs)
+            data = downloader.readall()
+        except ResourceNotFoundError:
+            return None, None
+        except HttpResponseError as e:
+            if e.status_code == 304:
+                return None, if_none_match
+            raise
+        self.bytes_downloaded += len(data)
+        return data, downloader.properties.etag
+
+    def etag(self, name: str):
+        """
+        Aktueller ETag (ein HEAD-Request) oder None, wenn der Blob nicht existiert.
+        """
+        from azure.core.exceptions import ResourceNotFoundError
+        try:
+            return self._blob(name).get_blob_properties().etag
+        except ResourceNotFoundError:
+            return None
+
+    def open(self, name: str):
+        """
+        Gepufferter, seekbarer Lesestream (Range-Downloads) oder None, wenn der Blob nicht existiert.
+        Alle Ranges stammen aus derselben Version, sonst BlobChanged.
+        """
+        from azure.core import MatchConditions
+        from azure.core.exceptions import ResourceModifiedError, ResourceNotFoundError
+        blob = self._blob(name)
+        try:
+            props = blob.get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+
+        def read_range(offset, length):
+            try:
+                return blob.download_blob(offset=offset, length=length, etag=props.etag,
+                                          match_condition=MatchConditions.IfNotModified).readall()
+            except (ResourceModifiedError, ResourceNotFoundError) as e:
+                raise BlobChanged(name) from e
+
+        return io.BufferedReader(_BlobReader(self, read_range, props.size, props.etag), buffer_size=READ_BUFFER_BYTES)
+
+    def upload(self, name: str, data: bytes, if_match: str = None, if_none_match: bool = False) -> str:
+        """
+        if_match: nur überschreiben, wenn der Blob noch diesen ETag hat.
+        if_none_match: nur anlegen, wenn es den Blob noch nicht gibt.
+        Returns:
+            str: neuer ETag. Raises BlobChanged, wenn die Bedingung nicht erfüllt ist.
+        """
+        from azure.core import MatchConditions
+        from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+        kwargs = {"overwrite": not if_none_match}
+        if if_match:
+            kwargs.update(etag=if_match, match_condition=MatchConditions.IfNotModified)
+        try:
+            try:
+                return self._blob(name).upload_blob(data, **kwargs)["etag"]
+            except ResourceNotFoundError:
+                if if_match:
+                    raise BlobChanged(name)
+                # Container fehlt (z.B. frisches Azurite) → anlegen und nochmal
+                self._create_container()
+                return self._blob(name).upload_blob(data, **kwargs)["etag"]
+        except (ResourceModifiedError, ResourceExistsError) as e:
+            raise BlobChanged(name) from e
+
+    def append(self, name: str, data: bytes):
+        """
+        Hängt data an einen Append Blob an, legt ihn (und den Container) bei Bedarf an.
+        """
+        from azure.core.exceptions import ResourceNotFoundError
+        blob = self._blob(name)
+        for start in range(0, len(data), APPEND_BLOCK_BYTES):
+            block = data[start:start + APPEND_BLOCK_BYTES]
+            try:
+                blob.append_block(block)
+            except ResourceNotFoundError:
+                try:
+                    blob.create_append_blob()
+                except ResourceNotFoundError:
+                    self._create_container()
+                    blob.create_append_blob()
+                blob.append_block(block)
+
+    def delete(self, name: str):
+        from azure.core.exceptions import ResourceNotFoundError
+        try:
+            self._blob(name).delete_blob()
+        except ResourceNotFoundError:
+            pass
+
+
+class LocalBlobStore:
+    """
+    Gleiche Schnittstelle wie AzureBlobStore, Blobs sind Dateien unter root.
+    Für lokale Läufe und Tests ohne Azure. Bedingte Uploads sind über eine Lock-Datei
+    (flock) auch zwischen Prozessen atomar.
+    """
+    def __init__(self, root: str):
+        self.root               = Path(root)
+        self.bytes_downloaded   = 0
+
+    def _path(self, name: str) -> Path:
+        return self.root / name
+
+    @staticmethod
+    def _etag_of(stat) -> str:
+        # os.replace legt eine neue Datei an: Inode + mtime + Größe ändern sich mit jedem Upload
+        return f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def download(self, name: str):
+        return self.download_versioned(name)[0]
+
+    def download_versioned(self, name: str, if_none_match: str = None) -> tuple:
+        try:
+            with self._path(name).open("rb") as f:
+                etag = self._etag_of(os.fstat(f.fileno()))
+                if if_none_match and etag == if_none_match:
+                    return None, etag
+                data = f.read()
+        except FileNotFoundError:
+            return None, None
+        self.bytes_downloaded += len(data)
+        return data, etag
+
+    def etag(self, name: str):
+        try:
+            return self._etag_of(self._path(name).stat())
+        except FileNotFoundError:
+            return None
+
+    def open(self, name: str):
+        try:
+            fd = os.open(self._path(name), os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        # über den offenen fd bleibt die gelesene Version stabil, auch wenn der Blob ersetzt wird
+        stat = os.fstat(fd)
+        read_range = lambda offset, length: os.pread(fd, length, offset)
+        reader = _BlobReader(self, read_range, stat.st_size, self._etag_of(stat), on_close=lambda: os.close(fd))
+        return io.BufferedReader(reader, buffer_size=READ_BUFFER_BYTES)
+
+    def upload(self, name: str, data: bytes, if_match: str = None, if_none_match: bool = False) -> str:
+        import fcntl
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # erst vollständig schreiben, dann umbenennen: wie ein Blob-Upload nie halb sichtbar
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        # Prüfen und Ersetzen unter einer Lock-Datei, damit bedingte Uploads atomar sind
+        with open(self.root / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            current = self.etag(name)
+            if (if_match and current != if_match) or (if_none_match and current is not None):
+                tmp.unlink()
+                raise BlobChanged(name)
+            os.replace(tmp, path)
+            return self.etag(name)
+
+    def append(self, name: str, data: bytes):
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def delete(self, name: str):
+        self._path(name).unlink(missing_ok=True)
+
+
+class CachingBlobStore:
+    """
+    Read-through-Cache vor einem AzureBlobStore/LocalBlobStore, gleiche Schnittstelle.
+
+    Jeder gelesene Blob liegt mit seinem ETag unter cache_dir. Beim nächsten Lesen (auch aus
+    einem anderen Prozess) wird nur bedingt heruntergeladen (if_none_match): ist der Blob
+    unverändert, kommt kein Body zurück und es wird die lokale Kopie gelesen (hits), sonst
+    wird die Kopie ersetzt (misses). Eigene Uploads landen mit dem neuen ETag direkt im Cache,
+    append und delete verwerfen die Kopie.
+
+    Cache-Datei: erste Zeile der ETag, danach die Bytes des Blobs; geschrieben wird über eine
+    temporäre Datei + os.replace, ETag und Inhalt passen also immer zusammen.
+    """
+    def __init__(self, store, cache_dir: str):
+        self.store      = store
+        self.cache_dir  = Path(cache_dir)
+        self.hits       = 0
+        self.misses     = 0
+
+    @property
+    def bytes_downloaded(self) -> int:
+        return self.store.bytes_downloaded
+
+    def _cache_path(self, name: str) -> Path:
+        return self.cache_dir / name
+
+    def _cached_etag(self, name: str):
+        try:
+            with self._cache_path(name).open("rb") as f:
+                return f.readline().rstrip(b"\n").decode("ascii") or None
+        except FileNotFoundError:
+            return None
+
+    def _put(self, name: str, data: bytes, etag: str):
+        path = self._cache_path(name)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(etag.encode("ascii") + b"\n" + data)
+            os.replace(tmp, path)
+        except OSError:
+            # der Cache ist nur eine Beschleunigung, ein volles/read-only Verzeichnis ist kein Fehler
+            self._drop(name)
+
+    def _drop(self, name: str):
+        self._cache_path(name).unlink(missing_ok=True)
+
+    def _refresh(self, name: str) -> str:
+        """
+        Bringt die lokale Kopie auf den aktuellen Stand (ein bedingter Download).
+        Returns:
+            ETag der Kopie oder None, wenn der Blob nicht existiert.
+        """
+        cached = self._cached_etag(name)
+        data, etag = self.store.download_versioned(name, if_none_match=cached)
+        if etag is None:
+            self.misses += 1
+            self._drop(name)
+        elif data is None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._put(name, data, etag)
+        return etag
+
+    def download(self, name: str):
+        return self.download_versioned(name)[0]
+
+    def download_versioned(self, name: str, if_none_match: str = None) -> tuple:
+        etag = self._refresh(name)
+        if etag is None or (if_none_match and etag == if_none_match):
+            return None, etag
+        try:
+            with self._cache_path(name).open("rb") as f:
+                if f.readline().rstrip(b"\n").decode("ascii") == etag:
+                    return f.read(), etag
+        except FileNotFoundError:
+            pass
+        # Kopie fehlt (nicht schreibbar) oder wurde parallel ersetzt: direkt laden
+        return self.store.download_versioned(name, if_none_match=if_none_match)
+
+    def etag(self, name: str):
+        return self.store.etag(name)
+
+    def open(self, name: str):
+        """
+        Liest aus der lokalen Kopie, nachdem sie per bedingtem Download geprüft bzw. ersetzt wurde.
+        Ein Miss lädt damit den ganzen Blob (auch bei Parquet mit columns), jeder weitere Start liest lokal.
+        """
+        etag = self._refresh(name)
+        if etag is None:
+            return None
+        try:
+            fd = os.open(self._cache_path(name), os.O_RDONLY)
+        except FileNotFoundError:
+            return self.store.open(name)
+        # Header über den fd lesen: eine parallel ersetzte Kopie hat einen anderen ETag
+        header = os.pread(fd, 256, 0).split(b"\n", 1)[0]
+        if header.decode("ascii") != etag:
+            os.close(fd)
+            return self.store.open(name)
+        offset, size = len(header) + 1, os.fstat(fd).st_size
+        read_range = lambda pos, length: os.pread(fd, length, offset + pos)
+        reader = _BlobReader(None, read_range, size - offset, etag, on_close=lambda: os.close(fd))
+        return io.BufferedReader(reader, buffer_size=READ_BUFFER_BYTES)
+
+    def upload(self, name: str, data: bytes, if_match: str = None, if_none_match: bool = False) -> str:
+        try:
+            etag = self.store.upload(name, data, if_match=if_match, if_none_match=if_none_match)
+        except BlobChanged:
+            self._drop(name)
+            raise
+        self._put(name, data, etag)
+        return etag
+
+    def append(self, name: str, data: bytes):
+        self._drop(name)
+        self.store.append(name, data)
+
+    def delete(self, name: str):
+        self._drop(name)
+        self.store.delete(name)
+
+
+def default_connection_string() -> str:
+    """
+    Connection String aus FBLIST_CONNECTION_STRING, sonst aus dem Key Vault (erst beim Aufruf, nicht beim Import).
+    """
+    if os.getenv(CONNECTION_STRING_ENV):
+        return os.getenv(CONNECTION_STRING_ENV)
+    # Key Vault SDK (azure-identity) nur laden, wenn er wirklich gebraucht wird
+    from utils.KVManager import get_cached_secret
+    return get_cached_secret(CONNECTION_STRING_SECRET)
+
+
+def backend_kind() -> str:
+    """
+    FBLIST_BACKEND, ohne Angabe local (mit FBLIST_LOCAL_DIR) bzw. azure.
+    """
+    return os.getenv(BACKEND_ENV) or ("local" if os.getenv(LOCAL_DIR_ENV) else "azure")
+
+
+def default_store(connection_string: str = None, container_name: str = "freelance-bot-list"):
+    """
+    Blob-Speicher nach Konfiguration: Azure (mit lokalem Cache) oder Dateien unter FBLIST_LOCAL_DIR.
+    Bei FBLIST_BACKEND=sqlite liegen Blobs ebenfalls lokal. Verbunden wird erst beim ersten Zugriff.
+    """
+    kind = backend_kind()
+    if kind in ("local", "sqlite"):
+        store = LocalBlobStore(os.path.join(os.getenv(LOCAL_DIR_ENV) or LOCAL_DIR_DEFAULT, container_name))
+    elif kind == "azure":
+        store = AzureBlobStore(connection_string or default_connection_string, container_name)
+    else:
+        raise ValueError(f"{BACKEND_ENV}={kind!r}: erwartet azure, local oder sqlite")
+    cache_dir = os.getenv(CACHE_DIR_ENV)
+    if cache_dir is None and kind == "azure":
+        import tempfile
+        cache_dir = os.path.join(tempfile.gettempdir(), "fblist_cache")
+    if cache_dir and cache_dir != "off":
+        store = CachingBlobStore(store, os.path.join(cache_dir, container_name))
+    return store
@@ -0,0 +1,73 @@
+from pathlib import Path
+import json
+import os
+import pandas as pd
+
+
+class CheckpointSink:
+    """
+    Append-only Checkpoint (JSONL) für gescrapte Zeilen.
+
+    Jede Zeile wird sofort angehängt und geflusht, ein Crash verliert also nichts,
+    was schon geschrieben wurde. Ein neuer Lauf mit demselben Pfad setzt fort:
+    done_urls() liefert alle bereits erledigten URLs. Erst to_dataframe() lädt alles
+    in den Speicher, während des Scrapings bleibt der Verbrauch konstant.
+    """
+    def __init__(self, path: str, columns: list):
+        self.path       = Path(path)
+        self.columns    = list(columns)
+        self._f         = None
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.iter_rows())
+
+    def iter_rows(self):
+        """
+        Liest den Checkpoint zeilenweise. Eine abgebrochene letzte Zeile wird übersprungen.
+        """
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def done_urls(self) -> set:
+        return {row["url"] for row in self.iter_rows()}
+
+    def write(self, row: list):
+        """
+        Hängt eine Zeile (Werte in der Reihenfolge von columns) an den Checkpoint an.
+        """
+        if self._f is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = self.path.open("a", encoding="utf-8")
+            # Nach einem Crash kann die letzte Zeile unvollständig sein, neue Zeilen nicht daran anhängen
+            if self._f.tell() and self._last_byte() != b"\n":
+                self._f.write("\n")
+        self._f.write(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def _last_byte(self) -> bytes:
+        with self.path.open("rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        self.close()
+        return pd.DataFrame(list(self.iter_rows()), columns=self.columns)
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def remove(self):
+        """
+        Löscht den Checkpoint, nachdem der Lauf erfolgreich exportiert wurde.
+        """
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -1,9 +1,53 @@
-from azure.storage.blob import BlobServiceClient
-from azure.core.exceptions import ResourceNotFoundError
-from KVManager import KeyVaultManager
-from io import StringIO
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.BlobStore import (BACKEND_ENV, CACHE_DIR_ENV, CONNECTION_STRING_ENV, LOCAL_DIR_DEFAULT, LOCAL_DIR_ENV,
+                             BlobChanged, CachingBlobStore, backend_kind, default_connection_string, default_store)
+from utils.TableBackends import (CsvSnapshotBackend, LogStructuredBackend, ParquetBackend, PartitionedBackend,
+                                 SqliteBackend, apply_changes)
+from contextlib import contextmanager
+import time
 import pandas as pd
 
+TABLE_COLS = ["url", "date", "url_checked"]
+# In batch() wird automatisch hochgeladen, sobald so viele Änderungen offen sind
+# oder seit dem letzten Upload so viele Sekunden vergangen sind (geprüft bei jeder Änderung)
+FLUSH_EVERY_ROWS = 500
+FLUSH_EVERY_SECONDS = 30.0
+# Speicher (FBLIST_BACKEND, FBLIST_LOCAL_DIR, FBLIST_CONNECTION_STRING, FBLIST_CACHE_DIR): utils/BlobStore.default_store
+# Datei für sqlite, Default: <FBLIST_LOCAL_DIR>/<container_name>.sqlite
+SQLITE_PATH_ENV = "FBLIST_SQLITE_PATH"
+# "csv" = ganzes fblist.csv pro Flush, "log" = Snapshot + Änderungslog,
+# "parquet" = ganze Tabelle als fblist.parquet (spaltenweise, braucht pyarrow),
+# "partitioned" = ein CSV pro Monat/Tag der Spalte date + Schlüssel-Index, siehe utils/TableBackends.py
+FORMAT_ENV = "FBLIST_FORMAT"
+# bei "partitioned": "month" (Default) oder "day"
+PARTITION_ENV = "FBLIST_PARTITION"
+
+
+def default_backend(connection_string: str = None, container_name: str = "freelance-bot-list", csv_name: str = "fblist.csv"):
+    """
+    Backend nach Konfiguration: Speicher aus FBLIST_BACKEND, bei Blobs das Format aus FBLIST_FORMAT.
+    Verbunden wird erst beim ersten Zugriff (Azure: auch der Connection String wird erst dann geholt).
+    """
+    if backend_kind() == "sqlite":
+        path = os.getenv(SQLITE_PATH_ENV) or os.path.join(os.getenv(LOCAL_DIR_ENV) or LOCAL_DIR_DEFAULT, f"{container_name}.sqlite")
+        return SqliteBackend(path, table=csv_name.rsplit(".", 1)[0])
+    store = default_store(connection_string, container_name)
+    table_format = os.getenv(FORMAT_ENV, "csv")
+    if table_format == "log":
+        return LogStructuredBackend(store, prefix=csv_name.rsplit(".", 1)[0], legacy_csv=csv_name)
+    if table_format == "parquet":
+        import importlib.util
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError(f"{FORMAT_ENV}=parquet braucht pyarrow: pip install 'freelance-bot[parquet]' (bzw. pip install pyarrow)")
+        return ParquetBackend(store, name=csv_name.rsplit(".", 1)[0] + ".parquet", legacy_csv=csv_name)
+    if table_format == "partitioned":
+        return PartitionedBackend(store, prefix=csv_name.rsplit(".", 1)[0], legacy_csv=csv_name,
+                                  granularity=os.getenv(PARTITION_ENV, "month"), schema=TABLE_COLS)
+    return CsvSnapshotBackend(store, csv_name)
+
+
 class DefaultTable:
     """
     Default table either a csv in a blob storage or a database or something else. 
@@ -12,41 +56,199 @@ class DefaultTable:
     - write
     - delete
 
-    We are now using a csv in the storage blob
+    Gespeichert wird über ein Backend (utils/TableBackends.py): das ganze CSV/Parquet im Blob
+    oder Snapshot + Änderungslog, jeweils in Azure oder lokal, oder eine SQLite-Datenbank
+    (default_backend). Blobs aus Azure liegen zusätzlich in einem lokalen Cache, ein Start mit
+    unveränderter Tabelle lädt nur einen bedingten GET ohne Body (utils/BlobStore.CachingBlobStore).
+
+    Ohne batch() wird jede Änderung sofort hochgeladen. In `with table.batch():` werden
+    Updates, Inserts und Deletes gepuffert und gesammelt geschrieben (flush()).
+
+    Upsert und Delete laufen in O(1): ein Index url -> Zeilenposition, neue Zeilen landen
+    in einem Append-Puffer, gelöschte werden nur markiert. self.df setzt das erst beim
+    Lesen (bzw. beim Upload) wieder zu einem DataFrame zusammen.
+
+    Parallele Writer (mehrere Function-Instanzen, Scraper-Prozesse) überschreiben sich nicht:
+    Uploads sind an den ETag gebunden, bei einem Konflikt wird neu gelesen und gemergt (stats()).
+
+    Bei partitionierten Backends enthält self.df nur die aktiven Partitionen. Alle übrigen URLs
+    stehen nur als Schlüssel in self._other_keys; `in`, len(), get() und Änderungen funktionieren
+    trotzdem für alle URLs, ohne alte Partitionen vorab zu laden.
+
+    Mit columns=["url", ...] werden nur diese Spalten geladen (z.B. für Membership-Checks);
+    die Tabelle ist dann nur lesbar, da ein Upload die übrigen Spalten verlieren würde.
     """
     def __init__(
             self, 
-            connection_string = KeyVaultManager().get_secret("conn-str-safreelancebotprod"),
+            connection_string = None,
             container_name = "freelance-bot-list",
-            csv_name = "fblist.csv"
+            csv_name = "fblist.csv",
+            flush_every_rows = FLUSH_EVERY_ROWS,
+            flush_every_seconds = FLUSH_EVERY_SECONDS,
+            backend = None,
+            columns = None,
             ):
-        self.connection_string      = connection_string
         self.container_name         = container_name
         self.csv_name               = csv_name
-        self.blob_service_client    = BlobServiceClient.from_connection_string(connection_string)
-        self.blob_client            = self.blob_service_client.get_blob_client(container=self.container_name, blob = self.csv_name)
+        self.backend                = backend or default_backend(connection_string, container_name, csv_name)
+        self.columns                = None if columns is None else list(dict.fromkeys(["url", *columns]))
+        self.flush_every_rows       = flush_every_rows
+        self.flush_every_seconds    = flush_every_seconds
+        self.flushes                = 0     # Anzahl Uploads
+        self._changes               = []    # Änderungen seit dem letzten Upload (siehe TableBackends)
+        self._batch_depth           = 0
+        self._rollback_df           = None  # Stand des letzten Uploads innerhalb von batch()
+        self._rollback_other        = None
+        self._last_flush            = time.monotonic()
         self.df                     = self._load_table_as_df()
+        # gespeicherte URLs außerhalb von self.df (nur bei partitionierten Backends)
+        self._other_keys            = set(self.backend.other_keys()) if hasattr(self.backend, "other_keys") else set()
+
+    # ------------------------- Speicher: Basis + Index + Append-Puffer -------------------------
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        Aktueller Stand als DataFrame. Puffer und Löschmarken werden dabei eingearbeitet (O(n), nur beim Lesen).
+        """
+        if self._appended or self._deleted:
+            keep = [pos for pos in range(len(self._base)) if pos not in self._deleted]
+            parts = [self._base.iloc[keep]] if len(keep) < len(self._base) else [self._base]
+            rows = [row for row in self._appended if row is not None]
+            if rows:
+                parts.append(pd.DataFrame(rows, columns=self._base.columns))
+            self._set_base(pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0].reset_index(drop=True))
+        return self._base
+
+    @df.setter
+    def df(self, df: pd.DataFrame):
+        self._set_base(df.reset_index(drop=True))
+
+    def _set_base(self, df: pd.DataFrame):
+        duplicates = df['url'].duplicated(keep='last')
+        if duplicates.any():
+            print(f"Dropped {int(duplicates.sum())} duplicate urls.")
+            df = df[~duplicates].reset_index(drop=True)
+        # object-Spalten: Einzelwerte per iat setzen, ohne dass pandas den dtype der Spalte ändern muss
+        self._base      = df.astype(object)
+        self._index     = {url: pos for pos, url in enumerate(df['url'].tolist())}  # url -> Position (Basis, dann Puffer)
+        self._appended  = []        # neue Zeilen als dict, None = im Puffer gelöscht
+        self._deleted   = set()     # gelöschte Positionen in self._base
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index or key in self._other_keys
+
+    def __len__(self) -> int:
+        return len(self._index) + len(self._other_keys)
+
+    def get(self, key: str) -> dict:
+        """
+        Zeile zu key als dict oder None, O(1) (URLs aus nicht geladenen Partitionen: einmal deren Download).
+        """
+        pos = self._index.get(key)
+        if pos is None:
+            if key not in self._other_keys:
+                return None
+            rows = {key: self.backend.get_row(key) or {"url": key}}
+            apply_changes(rows, [], [c for c in self._changes if c[1] == key])
+            return rows.get(key)
+        if pos >= len(self._base):
+            return dict(self._appended[pos - len(self._base)])
+        return self._base.iloc[pos].to_dict()
+
+    def _add_column(self, column: str):
+        self._base[column] = pd.Series(pd.NA, index=self._base.index, dtype=object)
+        print(f"Created column {column}.")
+
+    def _append(self, row: dict):
+        # Spalten, die die geladene Tabelle noch nicht hat (z.B. altes Schema), vorher anlegen,
+        # sonst fallen sie beim Zusammensetzen von self.df weg
+        for column in row:
+            if column not in self._base.columns:
+                self._add_column(column)
+        self._index[row['url']] = len(self._base) + len(self._appended)
+        self._appended.append(row)
+
+    def _set_value(self, pos: int, column: str, value):
+        if pos >= len(self._base):
+            self._appended[pos - len(self._base)][column] = value
+        else:
+            self._base.iat[pos, self._base.columns.get_loc(column)] = value
 
     def _load_table_as_df(self) -> pd.DataFrame:
         """
-        Lädt die Tabelle als DataFrame. Falls das CSV im Blob-Container
-        nicht existiert, wird es mit den Spalten 'url', 'date' und 'flag01'
+        Lädt die Tabelle als DataFrame. Falls es sie im Backend
+        noch nicht gibt, wird sie mit den Spalten aus TABLE_COLS
         neu angelegt und hochgeladen.
         """
-        try:
-            csv_text = self.blob_client.download_blob().content_as_text(encoding='utf-8')
-            df = pd.read_csv(StringIO(csv_text))
-        except ResourceNotFoundError:
+        df = self.backend.load(columns=self.columns)
+        if df is None:
             # Blob existiert nicht → neues leeres DataFrame mit Standard-Spalten
-            df = pd.DataFrame(columns=["url", "date", "flag01"])
+            df = pd.DataFrame(columns=TABLE_COLS)
             # direkt hochladen, damit der Blob beim nächsten mal existiert
-            self._upload(df)
+            try:
+                self.backend.create(df)
+            except BlobChanged:
+                # ein anderer Writer hat die Tabelle gerade angelegt
+                return self.backend.load(columns=self.columns)
             print(f"Blob '{self.csv_name}' nicht gefunden. Leeres CSV mit Spalten {df.columns.tolist()} angelegt.")
         return df
-    
-    def _upload (self, df: pd.DataFrame):
-        output = df.to_csv(index = False, encoding = 'utf-8')
-        self.blob_client.upload_blob(output, overwrite = True)
+
+    @contextmanager
+    def batch(self):
+        """
+        Puffert alle Änderungen im Block und lädt sie am Ende mit einem Upload hoch.
+        Zwischendurch wird automatisch geflusht (flush_every_rows / flush_every_seconds).
+        Bei einer Exception werden die noch nicht hochgeladenen Änderungen verworfen,
+        self.df steht dann wieder auf dem Stand des letzten Uploads.
+        """
+        outer = self._batch_depth == 0
+        if outer:
+            self._rollback_df = self.df.copy()
+            self._rollback_other = set(self._other_keys)
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if outer:
+                self.df = self._rollback_df
+                self._other_keys = self._rollback_other
+                self._rollback_df = self._rollback_other = None
+                self._changes = []
+            raise
+        self._batch_depth -= 1
+        if outer:
+            self.flush()
+            self._rollback_df = self._rollback_other = None
+
+    def flush(self):
+        """
+        Schreibt die offenen Änderungen ins Backend (CSV: ganze Tabelle, Log: nur die Änderungen).
+        Hat ein anderer Writer inzwischen geschrieben, mergt das Backend zeilenweise; self.df
+        enthält danach auch dessen Änderungen.
+        """
+        if self._changes:
+            merged = self.backend.commit(self._changes, lambda: self.df)
+            if merged is not None:
+                self.df = merged
+            self.flushes += 1
+            self._changes = []
+            if self._batch_depth:
+                self._rollback_df = self.df.copy()
+                self._rollback_other = set(self._other_keys)
+        self._last_flush = time.monotonic()
+
+    def _check_writable(self):
+        if self.columns is not None:
+            raise RuntimeError(f"DefaultTable mit columns={self.columns} ist nur lesbar.")
+
+    def _changed(self, *changes):
+        self._changes.extend(changes)
+        if (not self._batch_depth
+                or len(self._changes) >= self.flush_every_rows
+                or time.monotonic() - self._last_flush >= self.flush_every_seconds):
+            self.flush()
 
     def write_on_table(self, key: str, column: str, value):
         """
@@ -54,33 +256,89 @@ class DefaultTable:
         - Wenn vorhanden: Wert in Spalte 'column' setzen.
         - Wenn nicht vorhanden: Neue Zeile mit url=key und column=value anlegen.
         """
-        df = self.df
-
-        if column not in self.df.columns:
+        self._check_writable()
+        if column not in self._base.columns:
             # Optional: neue Spalte anlegen, falls sie noch nicht existiert
-            self.df[column] = pd.NA
-            print(f"Created column {column}.")
+            self._add_column(column)
 
-        if key in self.df['url'].values:
+        pos = self._index.get(key)
+        if pos is not None:
             # existierende Zeile updaten
-            self.df.loc[self.df['url'] == key, column] = value
+            self._set_value(pos, column, value)
             print(f"Updated row {key}.")
+
+        elif key in self._other_keys:
+            # Zeile liegt in einer nicht geladenen Partition: nur die Änderung merken
+            print(f"Updated row {key} (not loaded).")
         
         else:
             # neue Zeile anlegen
-            new_row = {col: None for col in df.columns}
-            new_row['url'] = key
-            new_row[column] = value
-            self.df = pd.concat([self.df, pd.DataFrame([new_row])], ignore_index=True)
+            self._append({'url': key, column: value})
             print(f"Created row {key}.")
         
-        self._upload(self.df)
+        self._changed(("upsert", key, {column: value}))
+
+    check_col_for_key = write_on_table
+
+    def add_new_urls(self, urls: list, date: str) -> list:
+        """
+        Legt für alle URLs, die noch nicht in der Spalte 'url' stehen, eine Zeile an
+        (date=date, url_checked=False) und lädt die Tabelle danach genau einmal hoch
+        (in batch() erst beim nächsten Flush).
+        Returns:
+            list: die neu angelegten URLs (leer → kein Upload)
+        """
+        self._check_writable()
+        new_urls = [u for u in dict.fromkeys(urls) if u not in self]
+        if not new_urls:
+            return []
+
+        rows = [{"url": url, "date": date, "url_checked": False} for url in new_urls]
+        for row in rows:
+            self._append(row)
+        self._changed(*(("upsert", row["url"], dict(row)) for row in rows))
+        print(f"Created {len(new_urls)} rows.")
+        return new_urls
 
     def delete_from_table(self, key: str):
-        self.df = self.df[self.df['url'] !=key].reset_index(drop = True)
-        self._upload(self.df)
+        self._check_writable()
+        if key in self._other_keys:
+            self._other_keys.discard(key)
+            self._changed(("delete", key, None))
+            print(f"Deleted url {key}.")
+            return
+        pos = self._index.pop(key, None)
+        if pos is None:
+            return
+        if pos >= len(self._base):
+            self._appended[pos - len(self._base)] = None
+        else:
+            self._deleted.add(pos)
+        self._changed(("delete", key, None))
         print(f"Deleted url {key}.")
 
+    delete_url_from_table = delete_from_table
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: {"flushes", "conflicts", "retries", ...} (Zähler des Backends, z.B. compactions,
+            mit Cache auch cache_hits/cache_misses)
+        """
+        counters = ("conflicts", "retries", "compactions", "partitions_loaded", "partitions_written")
+        stats = {"flushes": self.flushes, **{c: getattr(self.backend, c) for c in counters if hasattr(self.backend, c)}}
+        store = getattr(self.backend, "store", None)
+        if isinstance(store, CachingBlobStore):
+            stats.update(cache_hits=store.hits, cache_misses=store.misses)
+        return stats
+
+    def close(self):
+        """
+        Schreibt offene Änderungen und wartet auf eine laufende Kompaktierung.
+        """
+        self.flush()
+        self.backend.close()
+
 
 # — Beispielnutzung —
 if __name__ == "__main__":
@@ -91,4 +349,9 @@ if __name__ == "__main__":
     table.write_on_table("https://alte-url.de", "status", "verarbeitet")
 
     # Lösche Eintrag
-    table.delete_from_table("https://alte-url.de")
\ No newline at end of file
+    table.delete_from_table("https://alte-url.de")
+
+    # Viele Änderungen, ein Upload
+    with table.batch():
+        for i in range(1000):
+            table.check_col_for_key(f"https://beispiel.de/{i}", "url_checked", True)
\ No newline at end of file
@@ -0,0 +1,97 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.extractors import parse_project_detail
+import requests
+
+HTTP_WORKERS = 8
+REQUEST_TIMEOUT_SECONDS = 15
+
+
+class HttpDetailFetcher:
+    """
+    Holt Projekt-Detailseiten ohne Browser.
+    Nutzt die Cookies des eingeloggten Playwright-Contexts in einer gepoolten requests-Session
+    (Keep-Alive, eine Verbindung pro Worker) und parst die Seiten mit lxml (utils/extractors.py).
+    """
+    def __init__(
+            self,
+            cookies: list,
+            user_agent: str = None,
+            workers: int = HTTP_WORKERS,
+            timeout: float = REQUEST_TIMEOUT_SECONDS,
+            archive = None,
+            ):
+        """
+        archive: optional utils.PageArchive.PageArchive, jede geladene Seite wird dort abgelegt
+        """
+        self.workers = workers
+        self.archive = archive
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=workers,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+        # Playwright-Cookies ({name, value, domain, path, ...}) in die Session übernehmen
+        for c in cookies:
+            self.session.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+
+    def fetch(self, url: str) -> str:
+        """
+        Returns:
+            str: HTML der Seite oder None bei Fehlern.
+        """
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            if self.archive is not None:
+                self.archive.put(url, response.content, "detail", response.status_code,
+                                 response.headers.get("Content-Type"))
+            return response.text
+        except requests.RequestException as e:
+            print("HTTP fetch error:", url, e)
+            return None
+
+    def intel(self, url: str) -> dict:
+        """
+        Returns:
+            dict: Felder der Detailseite (siehe DETAIL_FIELDS) oder None, wenn die Seite nicht geladen
+            oder geparst werden konnte (z.B. leeres/abgeschnittenes Dokument). None landet im Browser-Fallback.
+        """
+        try:
+            html_str = self.fetch(url)
+            if html_str is None:
+                return None
+            return parse_project_detail(html_str)
+        except Exception as e:
+            # ein kaputtes Dokument darf nicht den ganzen map()-Lauf abbrechen
+            print("HTTP intel error:", url, e)
+            return None
+
+    def map(self, urls: list, on_result=None) -> list:
+        """
+        Holt und parst alle urls parallel. Die Reihenfolge bleibt erhalten.
+        on_result(idx, fields) wird im aufrufenden Thread aufgerufen, sobald eine Seite fertig ist
+        (wie bei utils/PagePool.PagePool.map).
+        """
+        out = [None] * len(urls)
+        with ThreadPoolExecutor(max_workers=self.workers) as ex:
+            futures = {ex.submit(self.intel, url): idx for idx, url in enumerate(urls)}
+            for future in as_completed(futures):
+                idx = futures[future]
+                out[idx] = future.result()
+                if on_result:
+                    on_result(idx, out[idx])
+        return out
+
+    def close(self):
+        self.session.close()
@@ -1,6 +1,7 @@
 from azure.identity import DefaultAzureCredential
 from azure.keyvault.secrets import SecretClient
 from typing import Optional
+from functools import lru_cache
 from dotenv import load_dotenv
 import os
 
@@ -47,4 +48,20 @@ class KeyVaultManager:
             str: Der Secret-Wert.
         """
         secret = self.client.get_secret(name=secret_name, version=version)
-        return secret.value
\ No newline at end of file
+        return secret.value
+
+
+@lru_cache(maxsize=None)
+def default_manager() -> KeyVaultManager:
+    """
+    Ein KeyVaultManager (und damit ein DefaultAzureCredential) pro Prozess.
+    """
+    return KeyVaultManager()
+
+
+@lru_cache(maxsize=None)
+def get_cached_secret(secret_name: str) -> str:
+    """
+    Liest ein Secret einmal aus dem Key Vault und hält es für die Laufzeit des Prozesses im Speicher.
+    """
+    return default_manager().get_secret(secret_name)
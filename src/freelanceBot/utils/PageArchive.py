@@ -0,0 +1,173 @@
+from pathlib import Path
+from typing import Iterator, Optional
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+INDEX_NAME = "index.sqlite"
+ITER_BATCH = 500
+
+
+class PageArchive:
+    """
+    Archiv aller geholten Seiten (Listing, Detailseiten, Agentur-Websites).
+
+    - Inhalt wird genau einmal gespeichert: gzip unter objects/<sha[:2]>/<sha>.gz (sha256 des Rohinhalts)
+    - Jeder Abruf ist eine Zeile im SQLite-Index (url, Zeitpunkt, sha256, Quelle, Status, Content-Type)
+    - latest(url) / lookup(url) für den gezielten Zugriff, iter_documents() streamt das Archiv
+      in Index-Reihenfolge, z.B. um Extraktoren ohne Netzwerk neu laufen zu lassen
+
+    Thread-safe, eine Instanz kann von allen Workern geteilt werden.
+    """
+    def __init__(self, root: str):
+        self.root       = Path(root)
+        self.objects    = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self._lock      = threading.Lock()
+        self._db        = sqlite3.connect(self.root / INDEX_NAME, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS fetches (
+                id           INTEGER PRIMARY KEY,
+                url          TEXT NOT NULL,
+                fetched_at   REAL NOT NULL,
+                sha256       TEXT NOT NULL,
+                source       TEXT NOT NULL,
+                status       INTEGER,
+                content_type TEXT,
+                size         INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS fetches_url ON fetches (url, fetched_at);
+            CREATE INDEX IF NOT EXISTS fetches_source ON fetches (source, id);
+        """)
+        self._db.commit()
+
+    def _object_path(self, sha: str) -> Path:
+        return self.objects / sha[:2] / f"{sha}.gz"
+
+    def put(self, url: str, body, source: str, status: int = 200,
+            content_type: str = "text/html", fetched_at: float = None) -> str:
+        """
+        Archiviert einen Abruf. body als bytes oder str (wird als UTF-8 gespeichert).
+        Returns:
+            str: sha256 des Inhalts
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        sha = hashlib.sha256(body).hexdigest()
+        path = self._object_path(sha)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # erst vollständig schreiben, dann umbenennen: ein Objekt ist nie halb geschrieben
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(gzip.compress(body, compresslevel=6))
+            os.replace(tmp, path)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO fetches (url, fetched_at, sha256, source, status, content_type, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, fetched_at or time.time(), sha, source, status, content_type, len(body)),
+            )
+            self._db.commit()
+        return sha
+
+    def get(self, sha: str) -> bytes:
+        return gzip.decompress(self._object_path(sha).read_bytes())
+
+    def lookup(self, url: str) -> list:
+        """
+        Alle Abrufe einer URL, neuester zuerst.
+        Returns:
+            list: [{"id", "url", "fetched_at", "sha256", "source", "status", "content_type", "size"}]
+        """
+        with self._lock:
+            cur = self._db.execute(
+                "SELECT * FROM fetches WHERE url = ? ORDER BY fetched_at DESC", (url,)
+            )
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+    def latest(self, url: str) -> Optional[bytes]:
+        """
+        Inhalt des letzten Abrufs der URL oder None.
+        """
+        entries = self.lookup(url)
+        return self.get(entries[0]["sha256"]) if entries else None
+
+    def iter_entries(self, source: str = None, since: float = None) -> Iterator[dict]:
+        """
+        Streamt die Index-Einträge (optional nur einer Quelle / ab einem Zeitpunkt) in Batches,
+        ohne den ganzen Index in den Speicher zu laden.
+        """
+        where, params = ["id > ?"], [0]
+        if source:
+            where.append("source = ?")
+            params.append(source)
+        if since:
+            where.append("fetched_at >= ?")
+            params.append(since)
+        query = f"SELECT * FROM fetches WHERE {' AND '.join(where)} ORDER BY id LIMIT {ITER_BATCH}"
+        while True:
+            with self._lock:
+                cur = self._db.execute(query, params)
+                cols = [c[0] for c in cur.description]
+                rows = [dict(zip(cols, row)) for row in cur.fetchall()]
+            if not rows:
+                return
+            yield from rows
+            params[0] = rows[-1]["id"]
+
+    def iter_documents(self, source: str = None, since: float = None, latest_only: bool = True) -> Iterator[tuple]:
+        """
+        Streamt (eintrag, inhalt) aus dem Archiv.
+        latest_only=True: pro URL nur der neueste Abruf (der Index wird dafür einmal vorab gelesen).
+        """
+        if latest_only:
+            with self._lock:
+                keep = {row[0] for row in self._db.execute(
+                    "SELECT MAX(id) FROM fetches GROUP BY url"
+                )}
+        for entry in self.iter_entries(source, since):
+            if latest_only and entry["id"] not in keep:
+                continue
+            yield entry, self.get(entry["sha256"])
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: {"fetches", "urls", "objects", "raw_bytes", "stored_bytes"}
+        """
+        with self._lock:
+            fetches, urls = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM fetches").fetchone()
+            objects, raw = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM (SELECT sha256, MAX(size) AS size FROM fetches GROUP BY sha256)"
+            ).fetchone()
+        stored = sum(p.stat().st_size for p in self.objects.glob("*/*.gz"))
+        return {"fetches": fetches, "urls": urls, "objects": objects, "raw_bytes": raw, "stored_bytes": stored}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+if __name__ == "__main__":
+    # python utils/PageArchive.py page_archive stats
+    # python utils/PageArchive.py page_archive reparse detail > details.jsonl
+    import json, sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.extractors import PARSERS, parse_listing
+
+    archive = PageArchive(sys.argv[1])
+    if sys.argv[2] == "stats":
+        print(json.dumps(archive.stats(), indent=2))
+    elif sys.argv[2] == "reparse":
+        kind = sys.argv[3]
+        for entry, body in archive.iter_documents(source=kind):
+            result = parse_listing(body, base_url=entry["url"]) if kind == "listing" else PARSERS[kind](body)
+            print(json.dumps({"url": entry["url"], "fetched_at": entry["fetched_at"],
+                              "result": result}, ensure_ascii=False))
@@ -0,0 +1,144 @@
+from playwright.sync_api import sync_playwright
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+from time import perf_counter
+import queue
+import threading
+
+
+@dataclass
+class WorkerStats:
+    """
+    Durchsatz eines Workers im PagePool.
+    """
+    worker_id: int
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def items_per_minute(self) -> float:
+        if not self.busy_seconds:
+            return 0.0
+        return self.items / self.busy_seconds * 60
+
+
+class PagePool:
+    """
+    Pool aus N Browser-Pages, die parallel abgearbeitet werden.
+
+    Die sync-API von Playwright ist an den Thread gebunden, in dem sie gestartet wurde.
+    Deshalb bekommt jeder Worker einen eigenen Thread mit eigener Playwright-Instanz,
+    eigenem Browser und eigenem Context. Die Session (Cookies, LocalStorage) wird über
+    den storage_state des eingeloggten persistent Contexts geteilt.
+
+    Verwendung:
+        pool = PagePool(fc.browser.storage_state(), workers=4)
+        results = pool.map(lambda page, url: fc.projects_intel(url, page), urls)
+        pool.print_stats()
+        pool.close()
+    """
+    def __init__(
+            self,
+            storage_state: dict,
+            workers: int = 4,
+            headless: bool = True,
+            viewport: Optional[dict] = None,
+            setup_context: Optional[Callable[[Any], None]] = None,
+            ):
+        self.storage_state  = storage_state
+        self.workers        = max(1, workers)
+        self.headless       = headless
+        self.viewport       = viewport or {'width': 1280, 'height': 800}
+        self.setup_context  = setup_context
+        self.stats          = [WorkerStats(worker_id=i) for i in range(self.workers)]
+        self.wall_seconds   = 0.0
+        self._tasks         = queue.Queue()
+        self._startup_errors = []
+        self._started       = threading.Barrier(self.workers + 1)
+        self._threads       = [
+            threading.Thread(target=self._run, args=(i,), name=f"page-pool-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+        # Warten, bis alle Worker ihren Browser gestartet haben
+        self._started.wait()
+        if self._startup_errors:
+            self.close()
+            raise RuntimeError(f"PagePool konnte nicht gestartet werden: {self._startup_errors[0]}")
+
+    def _run(self, worker_id: int):
+        stats = self.stats[worker_id]
+        pw = sync_playwright().start()
+        browser = None
+        page = None
+        try:
+            browser = pw.chromium.launch(headless=self.headless)
+            context = browser.new_context(storage_state=self.storage_state, viewport=self.viewport)
+            if self.setup_context:
+                self.setup_context(context)
+            page = context.new_page()
+        except Exception as e:
+            self._startup_errors.append(e)
+        finally:
+            self._started.wait()
+
+        try:
+            if page is None:
+                return
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    break
+                results, idx, func, item = task
+                t0 = perf_counter()
+                try:
+                    result = func(page, item)
+                except Exception as e:
+                    print(f"Worker {worker_id} error:", e)
+                    stats.errors += 1
+                    result = None
+                stats.busy_seconds += perf_counter() - t0
+                stats.items += 1
+                results.put((idx, result))
+        finally:
+            if browser:
+                browser.close()
+            pw.stop()
+
+    def map(self, func: Callable[[Any, Any], Any], items: Iterable, on_result: Callable[[int, Any], None] = None) -> list:
+        """
+        Wendet func(page, item) auf alle items an, verteilt auf die Worker.
+        Die Reihenfolge der Ergebnisse entspricht der Reihenfolge der items.
+        on_result(idx, result) wird im aufrufenden Thread aufgerufen, sobald ein Ergebnis fertig ist.
+        """
+        items = list(items)
+        t0 = perf_counter()
+        results = queue.Queue()
+        for idx, item in enumerate(items):
+            self._tasks.put((results, idx, func, item))
+
+        out = [None] * len(items)
+        for _ in range(len(items)):
+            idx, result = results.get()
+            out[idx] = result
+            if on_result:
+                on_result(idx, result)
+        self.wall_seconds += perf_counter() - t0
+        return out
+
+    def print_stats(self):
+        for s in self.stats:
+            print(f"Worker {s.worker_id}: {s.items} items, {s.errors} errors, "
+                  f"{s.busy_seconds:.1f}s busy, {s.items_per_minute:.1f} items/min")
+        total_items = sum(s.items for s in self.stats)
+        if self.wall_seconds:
+            print(f"Pool: {total_items} items in {self.wall_seconds:.1f}s, "
+                  f"{total_items / self.wall_seconds * 60:.1f} items/min with {self.workers} workers")
+
+    def close(self):
+        for _ in self._threads:
+            self._tasks.put(None)
+        for t in self._threads:
+            t.join()
@@ -0,0 +1,210 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+import threading
+
+######## CONFIGURATIONS ############
+# Ressourcentypen, die grundsätzlich geladen werden (Rest wird blockiert)
+ALLOWED_RESOURCE_TYPES = {"document", "script", "xhr", "fetch"}
+
+# Scripts nur von diesen Hosts (inkl. Subdomains), die Seite ist eine Angular-App
+ALLOWED_SCRIPT_HOSTS = ("freelance.de",)
+
+# Hosts, die immer blockiert werden (Consent, Tracking, Werbung)
+BLOCKED_HOSTS = (
+    "cookiebot.com",
+    "cookiebot.eu",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "linkedin.com",
+    "licdn.com",
+    "bing.com",
+    "clarity.ms",
+)
+
+# Script, das den Cookie-Banner einblendet
+COOKIEBOT_SCRIPT_URL = "https://consent.cookiebot.com/uc.js"
+####################################
+
+
+def _host_matches(host: str, domains) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+@dataclass
+class NavigationStats:
+    """
+    Requests und Bytes einer Navigation, aufgeschlüsselt nach Ressourcentyp.
+    """
+    url: str
+    requests: Counter = field(default_factory=Counter)
+    bytes: Counter = field(default_factory=Counter)
+    blocked: Counter = field(default_factory=Counter)
+
+
+class RequestPolicy:
+    """
+    page.route-Policy für den Browser-Context.
+    - Lässt nur ALLOWED_RESOURCE_TYPES durch, Scripts nur von ALLOWED_SCRIPT_HOSTS
+    - Blockiert BLOCKED_HOSTS immer (u.a. das Cookiebot-Script, damit kein Banner erscheint)
+    - Zählt Requests und Bytes pro Navigation und Ressourcentyp
+
+    Mit enabled=False wird nichts blockiert, aber weiter gezählt. So lassen sich
+    Bandbreite und Latenz mit und ohne Policy vergleichen. Der Route-Handler wird dann gar
+    nicht registriert: jede Route schaltet in Playwright den HTTP-Cache ab und würde die
+    Baseline verfälschen.
+    """
+    def __init__(
+            self,
+            enabled: bool = True,
+            allowed_types = ALLOWED_RESOURCE_TYPES,
+            allowed_script_hosts = ALLOWED_SCRIPT_HOSTS,
+            blocked_hosts = BLOCKED_HOSTS,
+            ):
+        self.enabled                = enabled
+        self.allowed_types          = set(allowed_types)
+        self.allowed_script_hosts   = tuple(allowed_script_hosts)
+        self.blocked_hosts          = tuple(blocked_hosts)
+        self.navigations            = []
+        self._current               = {}
+        self._lock                  = threading.Lock()
+
+    def allows(self, url: str, resource_type: str) -> bool:
+        """
+        True, wenn der Request laut Policy geladen werden darf.
+        """
+        if not self.enabled:
+            return True
+        host = (urlparse(url).hostname or "").lower()
+        if _host_matches(host, self.blocked_hosts):
+            return False
+        if resource_type not in self.allowed_types:
+            return False
+        if resource_type == "script":
+            return _host_matches(host, self.allowed_script_hosts)
+        return True
+
+    def blocks_cookie_banner(self) -> bool:
+        """
+        True, wenn das Cookiebot-Script blockiert wird. Dann erscheint kein Banner,
+        accept_cookies muss nicht auf den Button warten.
+        """
+        return not self.allows(COOKIEBOT_SCRIPT_URL, "script")
+
+    def install(self, context):
+        """
+        Registriert Route-Handler (nur wenn enabled) und Zähler auf dem Context und allen (künftigen) Pages.
+        """
+        if self.enabled:
+            context.route("**/*", self._handle)
+        context.on("requestfinished", self._on_finished)
+        context.on("page", self.watch)
+        for page in context.pages:
+            self.watch(page)
+
+    async def install_async(self, context):
+        """
+        Wie install, aber für einen Context aus playwright.async_api.
+        """
+        if self.enabled:
+            await context.route("**/*", self._handle_async)
+        context.on("requestfinished", self._on_finished_async)
+        context.on("page", self.watch)
+        for page in context.pages:
+            self.watch(page)
+
+    def watch(self, page):
+        """
+        Startet bei jeder Navigation des Hauptframes einen neuen Zähler.
+        """
+        page.on("framenavigated", lambda frame: frame == page.main_frame and self._begin(page, frame.url))
+
+    def _begin(self, page, url: str):
+        stats = NavigationStats(url=url)
+        with self._lock:
+            self._current[id(page)] = stats
+            self.navigations.append(stats)
+
+    def _stats_for(self, request) -> NavigationStats:
+        try:
+            return self._current.get(id(request.frame.page))
+        except Exception:
+            # z.B. Requests von Service Workern ohne Frame
+            return None
+
+    def _count_blocked(self, request):
+        stats = self._stats_for(request)
+        if stats:
+            with self._lock:
+                stats.blocked[request.resource_type] += 1
+
+    def _count_finished(self, request, sizes: dict):
+        stats = self._stats_for(request)
+        if not stats:
+            return
+        size = sizes["responseBodySize"] + sizes["responseHeadersSize"] if sizes else 0
+        with self._lock:
+            stats.requests[request.resource_type] += 1
+            stats.bytes[request.resource_type] += max(size, 0)
+
+    def _handle(self, route):
+        request = route.request
+        if self.allows(request.url, request.resource_type):
+            route.continue_()
+            return
+        self._count_blocked(request)
+        route.abort()
+
+    def _on_finished(self, request):
+        try:
+            sizes = request.sizes()
+        except Exception:
+            sizes = None
+        self._count_finished(request, sizes)
+
+    async def _handle_async(self, route):
+        request = route.request
+        if self.allows(request.url, request.resource_type):
+            await route.continue_()
+            return
+        self._count_blocked(request)
+        await route.abort()
+
+    async def _on_finished_async(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            sizes = None
+        self._count_finished(request, sizes)
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            dict: Summen über alle Navigationen ("navigations", "requests", "bytes", "blocked"),
+            jeweils nach Ressourcentyp.
+        """
+        requests, size, blocked = Counter(), Counter(), Counter()
+        with self._lock:
+            for nav in self.navigations:
+                requests.update(nav.requests)
+                size.update(nav.bytes)
+                blocked.update(nav.blocked)
+            n = len(self.navigations)
+        return {"navigations": n, "requests": dict(requests), "bytes": dict(size), "blocked": dict(blocked)}
+
+    def print_summary(self):
+        s = self.summary()
+        n = s["navigations"] or 1
+        total_bytes = sum(s["bytes"].values())
+        print(f"Network ({'policy on' if self.enabled else 'policy off'}): {s['navigations']} navigations, "
+              f"{sum(s['requests'].values()) / n:.1f} requests and {total_bytes / n / 1024:.0f} KB per navigation, "
+              f"{sum(s['blocked'].values())} blocked")
+        for rtype in sorted(s["requests"], key=lambda t: -s["bytes"].get(t, 0)):
+            print(f"  {rtype}: {s['requests'][rtype]} requests, {s['bytes'].get(rtype, 0) / 1024:.0f} KB")
+        for rtype, count in sorted(s["blocked"].items()):
+            print(f"  blocked {rtype}: {count}")
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import hashlib
+import json
+import re
+import threading
+
+PROJECT_ID_RE = re.compile(r"projekt-(\d+)")
+
+
+def project_id(url: str) -> str:
+    """
+    Stabile ID eines Projekts: die Nummer aus '.../projekt-1236689-SAP-Manager...'.
+    Fällt auf die URL ohne Query zurück, wenn keine Nummer enthalten ist.
+    """
+    m = PROJECT_ID_RE.search(url)
+    return m.group(1) if m else url.split("?")[0]
+
+
+def content_hash(values) -> str:
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+class SeenProjectIndex:
+    """
+    Persistenter Index der bereits gescrapten Projekte über mehrere Läufe hinweg.
+
+    Jede Zeile der JSONL-Datei ist ein Eintrag {id, url, scraped_at, hash}; beim Laden
+    gewinnt der letzte Eintrag pro id. Im Speicher liegt ein dict id -> Eintrag, Lookups
+    sind also O(1). Neue Einträge werden nur angehängt, compact() schreibt die Datei neu.
+    """
+    def __init__(self, path: str = "seen_projects.jsonl", refresh_after: timedelta = None):
+        self.path           = Path(path)
+        self.refresh_after  = refresh_after
+        self.entries        = {}
+        self._lines         = 0
+        self._lock          = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # z.B. abgebrochene letzte Zeile nach einem Crash
+                self.entries[entry["id"]] = entry
+                self._lines += 1
+
+    def __contains__(self, url: str) -> bool:
+        return project_id(url) in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def needs_scrape(self, url: str, refresh_after: timedelta = None) -> bool:
+        """
+        True, wenn das Projekt noch nie gescraped wurde oder der letzte Scrape
+        älter als refresh_after (default: self.refresh_after) ist.
+        """
+        entry = self.entries.get(project_id(url))
+        if entry is None:
+            return True
+        refresh_after = refresh_after or self.refresh_after
+        if refresh_after is None:
+            return False
+        scraped_at = datetime.fromisoformat(entry["scraped_at"])
+        return datetime.now(timezone.utc) - scraped_at > refresh_after
+
+    def add(self, url: str, values) -> bool:
+        """
+        Merkt sich ein gescraptes Projekt.
+        Returns:
+            True, wenn der Inhalt neu ist oder sich seit dem letzten Scrape geändert hat.
+        """
+        entry = {
+            "id": project_id(url),
+            "url": url,
+            "scraped_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "hash": content_hash(values),
+        }
+        with self._lock:
+            previous = self.entries.get(entry["id"])
+            self.entries[entry["id"]] = entry
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._lines += 1
+        return previous is None or previous["hash"] != entry["hash"]
+
+    def compact(self):
+        """
+        Schreibt nur noch den letzten Eintrag pro Projekt in die Datei.
+        """
+        with self._lock:
+            if self._lines <= len(self.entries):
+                return
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            tmp.replace(self.path)
+            self._lines = len(self.entries)
@@ -0,0 +1,670 @@
+from io import BytesIO
+from pathlib import Path
+import datetime
+import gzip
+import json
+import math
+import random
+import re
+import sqlite3
+import threading
+import time
+import pandas as pd
+
+from utils.BlobStore import BlobChanged
+
+# Nach so vielen Log-Records seit dem letzten Snapshot wird im Hintergrund kompaktiert
+COMPACT_EVERY_RECORDS = 5000
+PARQUET_COMPRESSION = "zstd"
+# Bedingte Uploads: so oft wird nach einem Konflikt neu gelesen, gemergt und erneut versucht
+MAX_COMMIT_RETRIES = 8
+RETRY_BACKOFF_SECONDS = 0.05    # verdoppelt sich pro Versuch, plus Zufall
+# SQLite: so lange wartet ein Writer auf das Schreib-Lock eines anderen Prozesses
+SQLITE_BUSY_TIMEOUT_SECONDS = 30.0
+# Deklarierte Typen in SQLite (alle anderen Spalten ohne Typ: Werte bleiben, wie sie geschrieben wurden)
+SQLITE_TYPES = {"url": "TEXT PRIMARY KEY", "url_checked": "BOOLEAN"}
+# Partitionierte Tabelle: eine Partition pro "day" oder "month" der Spalte date
+PARTITION_GRANULARITY = "month"
+UNDATED_PARTITION = "undated"   # Altbestand ohne gültiges Datum (nur bei der Migration)
+
+# Änderungen, wie DefaultTable sie an commit() übergibt:
+#   ("upsert", url, {spalte: wert, ...})  -> Zeile anlegen bzw. Spalten setzen
+#   ("delete", url, None)
+
+
+def _jsonable(value):
+    # numpy-Skalare (np.bool_, np.int64, ...) in Python-Typen, NaN bleibt NaN
+    return value.item() if hasattr(value, "item") else value
+
+
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def _backoff(attempt: int):
+    time.sleep(RETRY_BACKOFF_SECONDS * (2 ** attempt) * (0.5 + random.random()))
+
+
+def _read_csv(store, name: str, columns: list = None, compression: str = None) -> tuple:
+    """
+    CSV direkt aus dem Blob-Stream parsen (kein Zwischentext), optional nur einzelne Spalten.
+    Returns:
+        (DataFrame, etag) oder (None, None), wenn der Blob nicht existiert.
+    """
+    stream = store.open(name)
+    if stream is None:
+        return None, None
+    with stream:
+        usecols = None if columns is None else (lambda c: c in columns)
+        return pd.read_csv(stream, usecols=usecols, compression=compression), stream.raw.etag
+
+
+def apply_changes(rows: dict, columns: list, changes, wanted: list = None):
+    """
+    Spielt Änderungen zeilenweise ein (rows: url -> dict, columns wird um neue Spalten ergänzt).
+    Upserts setzen nur die übergebenen Spalten, Werte anderer Writer in anderen Spalten bleiben erhalten.
+    """
+    for op, url, values in changes:
+        if op == "delete":
+            rows.pop(url, None)
+            continue
+        if wanted is not None:
+            values = {k: v for k, v in values.items() if k in wanted}
+        rows.setdefault(url, {"url": url}).update(values)
+        columns.extend(c for c in values if c not in columns)
+
+
+def merge_changes(df: pd.DataFrame, changes: list, wanted: list = None) -> pd.DataFrame:
+    """
+    Änderungen auf einen DataFrame anwenden, z.B. eigene Änderungen auf den Stand eines anderen
+    Writers (Merge nach einem Konflikt). Nur die betroffenen Zeilen werden angefasst.
+    """
+    if not changes:
+        return df
+    columns = list(df.columns)
+    touched = df["url"].isin({url for _, url, _ in changes})
+    rows = {row["url"]: row for row in df[touched].to_dict("records")}
+    apply_changes(rows, columns, changes, wanted)
+    return pd.concat([df[~touched], pd.DataFrame(list(rows.values()), columns=columns)], ignore_index=True)
+
+
+class _SnapshotBackend:
+    """
+    Gemeinsame Logik für Formate, die bei jedem Commit die ganze Tabelle schreiben.
+
+    Der Upload ist an den ETag des zuletzt gelesenen/geschriebenen Stands gebunden. Hat ein anderer
+    Writer inzwischen hochgeladen, wird dessen Stand gelesen, die eigenen Änderungen zeilenweise
+    daraufgelegt und erneut bedingt hochgeladen (höchstens MAX_COMMIT_RETRIES mal, mit Backoff).
+    Kein globales Lock: parallele Writer verlieren keine Änderungen und blockieren sich nicht.
+    Subklassen implementieren _read(columns) -> (df, etag) und _serialize(df) -> bytes.
+    """
+    name = None
+
+    def __init__(self, store):
+        self.store      = store
+        self.etag       = None  # Version, auf der die lokalen Änderungen aufsetzen
+        self.conflicts  = 0     # fehlgeschlagene bedingte Uploads
+        self.retries    = 0     # erneute Upload-Versuche nach Merge
+
+    def load(self, columns: list = None) -> pd.DataFrame:
+        """
+        columns: nur diese Spalten laden (None = alle).
+        Returns:
+            DataFrame oder None, wenn es die Tabelle noch nicht gibt.
+        """
+        for attempt in range(MAX_COMMIT_RETRIES):
+            try:
+                df, etag = self._read(columns)
+                break
+            except BlobChanged:
+                # während des Lesens überschrieben → neu lesen
+                _backoff(attempt)
+        else:
+            raise BlobChanged(self.name)
+        if columns is None:
+            self.etag = etag
+        return df
+
+    def create(self, df: pd.DataFrame):
+        self.etag = self.store.upload(self.name, self._serialize(df), if_none_match=True)
+
+    def commit(self, changes: list, snapshot):
+        """
+        snapshot: Callable, das den aktuellen Stand als DataFrame liefert.
+        Returns:
+            None, oder nach einem Konflikt den gemergten Stand (DataFrame), den DefaultTable übernimmt.
+        """
+        df, merged = snapshot(), None
+        for attempt in range(MAX_COMMIT_RETRIES + 1):
+            try:
+                self.etag = self.store.upload(self.name, self._serialize(df),
+                                              if_match=self.etag, if_none_match=self.etag is None)
+                return merged
+            except BlobChanged:
+                self.conflicts += 1
+                if attempt == MAX_COMMIT_RETRIES:
+                    raise
+                _backoff(attempt)
+                self.retries += 1
+                remote = self.load()
+                df = merged = merge_changes(remote, changes) if remote is not None else df
+
+    def close(self):
+        pass
+
+
+class CsvSnapshotBackend(_SnapshotBackend):
+    """
+    Die ganze Tabelle als ein CSV (fblist.csv). Jeder Commit lädt sie komplett neu hoch.
+    compress=True: gzip-komprimiert (z.B. für den Schlüssel-Index von PartitionedBackend).
+    """
+    def __init__(self, store, csv_name: str = "fblist.csv", compress: bool = False):
+        super().__init__(store)
+        self.name       = csv_name
+        self.csv_name   = csv_name
+        self.compress   = compress
+
+    def _read(self, columns):
+        return _read_csv(self.store, self.name, columns, compression="gzip" if self.compress else None)
+
+    def _serialize(self, df: pd.DataFrame) -> bytes:
+        data = _csv_bytes(df)
+        return gzip.compress(data, compresslevel=6) if self.compress else data
+
+
+class ParquetBackend(_SnapshotBackend):
+    """
+    Die ganze Tabelle als ein Parquet-File (spaltenweise, zstd-komprimiert, typisierte Spalten).
+
+    load(columns=["url"]) liest über Range-Requests nur Footer und die gewünschten Spalten,
+    z.B. für reine Membership-Checks. Jeder Commit schreibt die Tabelle komplett neu wie
+    CsvSnapshotBackend, nur deutlich kleiner. Ein vorhandenes legacy_csv wird gelesen,
+    solange es das Parquet-File noch nicht gibt; der erste Commit legt es an.
+    pyarrow wird erst beim ersten Zugriff importiert.
+    """
+    def __init__(self, store, name: str = "fblist.parquet", legacy_csv: str = "fblist.csv"):
+        super().__init__(store)
+        self.name       = name
+        self.legacy_csv = legacy_csv
+
+    def _read(self, columns):
+        import pyarrow.parquet as pq
+        stream = self.store.open(self.name)
+        if stream is None:
+            if not self.legacy_csv:
+                return None, None
+            # ETag None: der erste Commit legt das Parquet-File nur an, wenn es noch keiner angelegt hat
+            return _read_csv(self.store, self.legacy_csv, columns)[0], None
+        with stream:
+            parquet = pq.ParquetFile(stream)
+            if columns is not None:
+                columns = [c for c in parquet.schema_arrow.names if c in columns]
+            return parquet.read(columns=columns).to_pandas(), stream.raw.etag
+
+    def _serialize(self, df: pd.DataFrame) -> bytes:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        # Spalten mit gemischten Werten (object) als Text, der Rest mit dem kleinsten passenden Typ
+        df = df.convert_dtypes()
+        for column in df.columns:
+            if df[column].dtype == object:
+                df[column] = df[column].astype("string")
+        out = BytesIO()
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out, compression=PARQUET_COMPRESSION)
+        return out.getvalue()
+
+
+def partition_key(date, granularity: str = PARTITION_GRANULARITY):
+    """
+    "2026-10-18" -> "2026-10" (month) bzw. "2026-10-18" (day), None ohne gültiges ISO-Datum.
+    """
+    text = date.isoformat() if isinstance(date, datetime.date) else str(date)
+    if not re.match(r"\d{4}-\d{2}-\d{2}", text):
+        return None
+    return text[:10] if granularity == "day" else text[:7]
+
+
+class PartitionedBackend:
+    """
+    Tabelle aufgeteilt nach der Spalte date: ein CSV pro Tag oder Monat (<prefix>/part-<key>.csv)
+    plus globaler Schlüssel-Index url -> Partition (<prefix>/index.csv.gz).
+
+    - load liest den Index und nur die aktiven Partitionen (die active neuesten bis heute,
+      Default: nur die aktuelle). Alle anderen URLs kennt DefaultTable über other_keys().
+    - commit schreibt nur die Partitionen, in denen sich etwas geändert hat, und den Index nur,
+      wenn URLs dazukommen oder wegfallen. Eine alte Partition wird nur geladen, wenn eine ihrer
+      Zeilen geändert oder per get_row gelesen wird.
+    - Die Partition einer URL ergibt sich beim Anlegen aus date (ohne gültiges Datum: aktuelle
+      Partition) und bleibt danach fest.
+    Partitionen und Index sind CsvSnapshotBackends, also ETag-bedingt mit Merge bei Konflikten.
+    Ein vorhandenes legacy_csv wird beim ersten Laden einmalig in Partitionen aufgeteilt.
+    Eine Partition, die es noch nicht gibt (z.B. am Monatsanfang), beginnt mit den Spalten einer
+    geladenen Partition bzw. schema (DefaultTable: TABLE_COLS).
+    """
+    def __init__(self, store, prefix: str = "fblist", granularity: str = PARTITION_GRANULARITY,
+                 active: int = 1, legacy_csv: str = "fblist.csv", today=None, schema: list = None):
+        self.store              = store
+        self.prefix             = prefix
+        self.granularity        = granularity
+        self.active             = active
+        self.legacy_csv         = legacy_csv
+        self.today              = today or datetime.date.today     # Callable, für Tests
+        self.schema             = list(schema or ["url"])
+        self.index              = CsvSnapshotBackend(store, f"{prefix}/index.csv.gz", compress=True)
+        self.keys               = {}    # url -> Partition (globaler Index)
+        self.loaded             = []    # aktive Partitionen, deren Zeilen DefaultTable im df hat
+        self.partitions_loaded  = 0
+        self.partitions_written = 0
+        self._index_df          = None
+        self._parts             = {}    # Partition -> (CsvSnapshotBackend, DataFrame)
+
+    @property
+    def conflicts(self) -> int:
+        return self.index.conflicts + sum(backend.conflicts for backend, _ in self._parts.values())
+
+    @property
+    def retries(self) -> int:
+        return self.index.retries + sum(backend.retries for backend, _ in self._parts.values())
+
+    def _current(self) -> str:
+        return partition_key(self.today(), self.granularity)
+
+    def _part(self, key: str, columns: list = None) -> pd.DataFrame:
+        if key not in self._parts:
+            backend = CsvSnapshotBackend(self.store, f"{self.prefix}/part-{key}.csv")
+            df = backend.load(columns)
+            self.partitions_loaded += df is not None
+            self._parts[key] = (backend, self._empty(columns) if df is None else df)
+        return self._parts[key][1]
+
+    def _empty(self, columns: list = None) -> pd.DataFrame:
+        known = [df.columns for _, df in self._parts.values() if len(df.columns) > 1]
+        schema = list(known[-1]) if known else self.schema
+        return pd.DataFrame(columns=[c for c in schema if columns is None or c in columns])
+
+    def _migrate_legacy(self) -> bool:
+        df = _read_csv(self.store, self.legacy_csv)[0] if self.legacy_csv else None
+        if df is None:
+            return False
+        dates = df["date"] if "date" in df.columns else pd.Series(None, index=df.index)
+        keys = dates.map(lambda d: partition_key(d, self.granularity) or UNDATED_PARTITION)
+        for key, part in df.groupby(keys):
+            try:
+                CsvSnapshotBackend(self.store, f"{self.prefix}/part-{key}.csv").create(part)
+            except BlobChanged:
+                pass    # parallel migriert
+        try:
+            # der Index zuletzt: erst wenn es ihn gibt, gilt die Migration als fertig
+            self.index.create(pd.DataFrame({"url": df["url"], "partition": keys}))
+        except BlobChanged:
+            pass
+        return True
+
+    def load(self, columns: list = None) -> pd.DataFrame:
+        self._index_df = self.index.load()
+        if self._index_df is None:
+            if not self._migrate_legacy():
+                return None
+            self._index_df = self.index.load()
+        self.keys = dict(zip(self._index_df["url"].tolist(), self._index_df["partition"].tolist()))
+        current = self._current()
+        dated = sorted({key for key in self.keys.values() if key != UNDATED_PARTITION and key <= current} | {current})
+        self.loaded = dated[-self.active:]
+        frames = [self._part(key, columns) for key in self.loaded]
+        for key, frame in zip(self.loaded, frames):
+            # Zeilen, deren Index-Eintrag nach einem Abbruch fehlt, gehören trotzdem hierher
+            for url in frame["url"].tolist():
+                self.keys.setdefault(url, key)
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def other_keys(self) -> list:
+        """
+        URLs, die gespeichert sind, aber nicht in den aktiven Partitionen liegen.
+        """
+        loaded = set(self.loaded)
+        return [url for url, key in self.keys.items() if key not in loaded]
+
+    def get_row(self, url: str):
+        """
+        Zeile einer URL aus einer beliebigen Partition (lädt die Partition bei Bedarf) oder None.
+        """
+        key = self.keys.get(url)
+        if key is None:
+            return None
+        df = self._part(key)
+        rows = df[df["url"] == url].to_dict("records")
+        return rows[0] if rows else None
+
+    def create(self, df: pd.DataFrame):
+        self.index.create(pd.DataFrame(columns=["url", "partition"]))
+        self._index_df = pd.DataFrame(columns=["url", "partition"])
+        self.keys = {}
+        self.loaded = [self._current()]
+        empty = df.iloc[:0]
+        self._parts = {self.loaded[0]: (CsvSnapshotBackend(self.store, f"{self.prefix}/part-{self.loaded[0]}.csv"), empty)}
+        if len(df):
+            self.commit([("upsert", row["url"], row) for row in df.to_dict("records")], None)
+
+    def commit(self, changes: list, snapshot):
+        """
+        snapshot wird nicht gebraucht: jede betroffene Partition bekommt nur ihre Änderungen.
+        Returns:
+            None, oder nach einem Merge in einer aktiven Partition deren neuer Stand (für DefaultTable).
+        """
+        by_part, index_changes = {}, []
+        for change in changes:
+            op, url, values = change
+            key = self.keys.get(url)
+            if key is None:
+                if op == "delete":
+                    continue
+                key = partition_key(values.get("date"), self.granularity) or self._current()
+                self.keys[url] = key
+                index_changes.append(("upsert", url, {"partition": key}))
+            elif op == "delete":
+                del self.keys[url]
+                index_changes.append(("delete", url, None))
+            by_part.setdefault(key, []).append(change)
+
+        merged_active = False
+        for key, part_changes in by_part.items():
+            new_df = merge_changes(self._part(key), part_changes)
+            backend = self._parts[key][0]
+            merged = backend.commit(part_changes, lambda: new_df)
+            self._parts[key] = (backend, new_df if merged is None else merged)
+            if merged is not None:
+                # Zeilen anderer Writer in dieser Partition sind jetzt bekannt
+                for url in merged["url"].tolist():
+                    self.keys.setdefault(url, key)
+            self.partitions_written += 1
+            merged_active |= merged is not None and key in self.loaded
+
+        if index_changes:
+            new_index = merge_changes(self._index_df, index_changes)
+            merged = self.index.commit(index_changes, lambda: new_index)
+            self._index_df = new_index if merged is None else merged
+            if merged is not None:
+                # URLs, die andere Writer inzwischen angelegt haben
+                self.keys.update(zip(merged["url"].tolist(), merged["partition"].tolist()))
+
+        if merged_active:
+            frames = [self._part(key) for key in self.loaded]
+            return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        return None
+
+    def close(self):
+        pass
+
+
+class LogStructuredBackend:
+    """
+    Tabelle als Snapshot (CSV) plus Änderungslog (JSONL in Append Blobs).
+
+    - commit hängt nur die Änderungen an, die Kosten wachsen mit den Änderungen statt mit der Tabelle
+    - load liest den Snapshot und spielt die Logs in der Reihenfolge aus dem Manifest nach
+    - nach compact_every Records schreibt ein Hintergrund-Thread einen neuen Snapshot
+
+    Manifest <prefix>/manifest.json: {"seq", "snapshot", "logs"}. Beim Kompaktieren wird zuerst
+    ein neues Log ins Manifest eingetragen (alle weiteren Commits landen dort), dann der Snapshot
+    aus Snapshot + alten Logs im Speicher gebaut und erst danach das Manifest auf Snapshot + neues
+    Log umgestellt. Ein Abbruch dazwischen hinterlässt immer ein gültiges Manifest.
+    Ein vorhandenes legacy_csv (fblist.csv) wird beim ersten Laden zum Start-Snapshot.
+
+    Mehrere Writer: Appends konkurrieren nicht. Das Manifest wird nur bedingt (ETag) geändert, es
+    kompaktiert also immer nur einer. Ändert sich das Manifest während eines Appends (Kompaktierung
+    eines anderen Writers), wird das Manifest neu gelesen und der Append im aktuellen Log wiederholt;
+    doppelte Records sind beim Nachspielen harmlos.
+    """
+    def __init__(self, store, prefix: str = "fblist", compact_every: int = COMPACT_EVERY_RECORDS,
+                 legacy_csv: str = "fblist.csv"):
+        self.store          = store
+        self.prefix         = prefix
+        self.compact_every  = compact_every
+        self.legacy_csv     = legacy_csv
+        self.manifest       = None
+        self.manifest_etag  = None
+        self.log_records    = 0     # Records im Log seit dem letzten (begonnenen) Snapshot
+        self.compactions    = 0
+        self.conflicts      = 0     # Manifest von einem anderen Writer geändert
+        self.retries        = 0     # wiederholte Appends
+        self._lock          = threading.Lock()
+        self._compactor     = None
+
+    @property
+    def manifest_name(self) -> str:
+        return f"{self.prefix}/manifest.json"
+
+    def _name(self, kind: str, seq: int, ext: str) -> str:
+        return f"{self.prefix}/{kind}-{seq:06d}.{ext}"
+
+    def _write_manifest(self, manifest: dict, expected_etag: str = None):
+        """
+        Bedingter Upload: nur wenn das Manifest noch expected_etag hat (None = nur anlegen), sonst BlobChanged.
+        """
+        self.manifest_etag = self.store.upload(self.manifest_name, json.dumps(manifest).encode("utf-8"),
+                                               if_match=expected_etag, if_none_match=expected_etag is None)
+        self.manifest = manifest
+        return self.manifest_etag
+
+    def _read_manifest(self) -> bool:
+        raw, etag = self.store.download_versioned(self.manifest_name)
+        if raw is None:
+            return False
+        self.manifest, self.manifest_etag = json.loads(raw), etag
+        return True
+
+    def _records(self, manifest: dict):
+        for log in manifest["logs"]:
+            data = self.store.download(log)
+            for line in (data or b"").splitlines():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue    # abgebrochener Append
+
+    def _replay(self, manifest: dict, columns: list = None) -> tuple:
+        """
+        Returns:
+            (DataFrame, Anzahl Log-Records)
+        """
+        df = _read_csv(self.store, manifest["snapshot"], columns)[0]
+        records = list(self._records(manifest))
+        return merge_changes(df, records, wanted=columns), len(records)
+
+    def load(self, columns: list = None) -> pd.DataFrame:
+        if not self._read_manifest():
+            if not self.legacy_csv or self.store.etag(self.legacy_csv) is None:
+                return None
+            # bestehendes CSV bleibt unverändert liegen und dient als erster Snapshot
+            try:
+                self._write_manifest({"seq": 0, "snapshot": self.legacy_csv, "logs": [self._name("log", 0, "jsonl")]})
+            except BlobChanged:
+                self._read_manifest()   # ein anderer Writer war schneller
+        df, self.log_records = self._replay(self.manifest, columns)
+        return df
+
+    def create(self, df: pd.DataFrame):
+        snapshot = self._name("snapshot", 0, "csv")
+        self.store.upload(snapshot, _csv_bytes(df))
+        self._write_manifest({"seq": 0, "snapshot": snapshot, "logs": [self._name("log", 0, "jsonl")]})
+        self.log_records = 0
+
+    def commit(self, changes: list, snapshot):
+        if not changes:
+            return
+        payload = "".join(
+            json.dumps([op, url, {k: _jsonable(v) for k, v in (values or {}).items()}], ensure_ascii=False) + "\n"
+            for op, url, values in changes
+        ).encode("utf-8")
+        with self._lock:
+            for attempt in range(MAX_COMMIT_RETRIES + 1):
+                self.store.append(self.manifest["logs"][-1], payload)
+                if self.store.etag(self.manifest_name) == self.manifest_etag:
+                    break
+                # Manifest wurde umgestellt: evtl. in ein schon kompaktiertes Log geschrieben
+                self.conflicts += 1
+                self._read_manifest()
+                if attempt == MAX_COMMIT_RETRIES:
+                    raise BlobChanged(self.manifest_name)
+                self.retries += 1
+            self.log_records += len(changes)
+            if self.log_records >= self.compact_every and not self._compacting():
+                self._start_compaction()
+
+    def compact(self, wait: bool = True):
+        """
+        Schreibt sofort einen neuen Snapshot.
+        """
+        with self._lock:
+            if not self._compacting():
+                self._start_compaction()
+        if wait:
+            self.close()
+
+    def _compacting(self) -> bool:
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def _start_compaction(self):
+        # unter self._lock: ab jetzt wird in ein neues Log geschrieben
+        old = dict(self.manifest)
+        seq = old["seq"] + 1
+        new_log = self._name("log", seq, "jsonl")
+        try:
+            etag = self._write_manifest({"seq": seq, "snapshot": old["snapshot"], "logs": old["logs"] + [new_log]},
+                                        self.manifest_etag)
+        except BlobChanged:
+            # ein anderer Writer hat das Manifest geändert (kompaktiert gerade selbst)
+            self.conflicts += 1
+            self._read_manifest()
+            return
+        self.log_records = 0
+        self._compactor = threading.Thread(target=self._compact, args=(old, seq, new_log, etag), daemon=True)
+        self._compactor.start()
+
+    def _compact(self, old: dict, seq: int, new_log: str, etag: str):
+        snapshot_name = self._name("snapshot", seq, "csv")
+        try:
+            # Snapshot aus dem gespeicherten Stand, damit auch Records anderer Writer enthalten sind
+            df, _ = self._replay(old)
+            self.store.upload(snapshot_name, _csv_bytes(df))
+            with self._lock:
+                # nur, wenn seit dem Umschalten auf new_log niemand sonst das Manifest geändert hat
+                self._write_manifest({"seq": seq, "snapshot": snapshot_name, "logs": [new_log]}, etag)
+            for name in [old["snapshot"], *old["logs"]]:
+                # das ursprüngliche fblist.csv wird nie gelöscht
+                if name.startswith(f"{self.prefix}/"):
+                    self.store.delete(name)
+            self.compactions += 1
+        except BlobChanged:
+            with self._lock:
+                self.conflicts += 1
+                self._read_manifest()
+            self.store.delete(snapshot_name)
+        except Exception as e:
+            print("Kompaktierung fehlgeschlagen:", e)
+
+    def close(self):
+        if self._compactor is not None:
+            self._compactor.join()
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_value(value):
+    value = _jsonable(value)
+    if value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+class SqliteBackend:
+    """
+    Tabelle als SQLite-Datenbank, eine Zeile pro URL (url ist Primärschlüssel).
+
+    commit schreibt nur die geänderten Zeilen (INSERT ... ON CONFLICT DO UPDATE bzw. DELETE) in einer
+    Transaktion, die Kosten hängen also nur von der Zahl der Änderungen ab. Upserts setzen nur die
+    übergebenen Spalten, neue Spalten werden per ALTER TABLE angelegt. Mehrere Prozesse können
+    gleichzeitig schreiben (WAL, busy_timeout), es gibt keine Konflikte zum Mergen.
+    Die Verbindung wird erst beim ersten Zugriff geöffnet.
+    """
+    def __init__(self, path: str, table: str = "fblist"):
+        self.path       = path
+        self.table      = table
+        self._db        = None
+        self._lock      = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        return self._db
+
+    def _columns(self) -> dict:
+        """
+        Returns:
+            dict: spalte -> deklarierter Typ, leer wenn es die Tabelle nicht gibt
+        """
+        return {row[1]: row[2] for row in self._conn().execute(f"PRAGMA table_info({_quote(self.table)})")}
+
+    def load(self, columns: list = None) -> pd.DataFrame:
+        with self._lock:
+            declared = self._columns()
+            if not declared:
+                return None
+            names = [c for c in declared if columns is None or c in columns]
+            cursor = self._conn().execute(
+                f"SELECT {', '.join(map(_quote, names))} FROM {_quote(self.table)} ORDER BY rowid"
+            )
+            df = pd.DataFrame(cursor.fetchall(), columns=names)
+        for column in names:
+            if declared[column] == "BOOLEAN":
+                values = df[column]
+                df[column] = values.astype("boolean").astype(object).where(values.notna(), None)
+        return df
+
+    def create(self, df: pd.DataFrame):
+        columns = ", ".join(f"{_quote(c)} {SQLITE_TYPES.get(c, '')}".rstrip() for c in df.columns)
+        with self._lock:
+            with self._conn():
+                self._conn().execute(f"CREATE TABLE IF NOT EXISTS {_quote(self.table)} ({columns})")
+        if len(df):
+            self.commit([("upsert", row["url"], row) for row in df.to_dict("records")], None)
+
+    def commit(self, changes: list, snapshot):
+        """
+        snapshot wird nicht gebraucht (nur für die gemeinsame Schnittstelle).
+        """
+        table = _quote(self.table)
+        with self._lock:
+            db = self._conn()
+            with db:    # eine Transaktion für alle Änderungen
+                known = set(self._columns())
+                for op, url, values in changes:
+                    if op == "delete":
+                        db.execute(f"DELETE FROM {table} WHERE url = ?", (url,))
+                        continue
+                    values = {k: _sql_value(v) for k, v in values.items() if k != "url"}
+                    for column in values:
+                        if column not in known:
+                            db.execute(f"ALTER TABLE {table} ADD COLUMN {_quote(column)} {SQLITE_TYPES.get(column, '')}".rstrip())
+                            known.add(column)
+                    if not values:
+                        db.execute(f"INSERT OR IGNORE INTO {table} (url) VALUES (?)", (url,))
+                        continue
+                    names = list(values)
+                    db.execute(
+                        f"INSERT INTO {table} (url, {', '.join(map(_quote, names))}) "
+                        f"VALUES ({', '.join('?' * (len(names) + 1))}) "
+                        f"ON CONFLICT(url) DO UPDATE SET {', '.join(f'{_quote(n)} = excluded.{_quote(n)}' for n in names)}",
+                        (url, *values.values()),
+                    )
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,141 @@
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from collections import Counter, defaultdict
+from time import perf_counter
+import threading
+
+######## CONFIGURATIONS ############
+# Timeout in ms pro Bedingung
+DEFAULT_WAIT_TIMEOUTS = {
+    "listing_cards": 15000,     # Projektkarten auf der Übersicht
+    "contact_block": 3000,      # Kontaktblock nach Klick auf "Kontaktdaten anzeigen" (auch ohne E-Mail vorhanden)
+}
+DEFAULT_TIMEOUT = 5000
+SETTLE_MS = 300                 # so lange muss die Anzahl der Elemente stabil bleiben
+POLL_MS = 100
+
+# Läuft im Browser: True, sobald die Anzahl der Treffer für SETTLE_MS unverändert und > 0 ist
+COUNT_SETTLED_JS = """
+([sel, settleMs]) => {
+    const n = document.querySelectorAll(sel).length;
+    const state = window.__fbSettle || (window.__fbSettle = {});
+    const now = performance.now();
+    if (!state[sel] || state[sel].n !== n) {
+        state[sel] = {n: n, t: now};
+        return false;
+    }
+    return n > 0 && now - state[sel].t >= settleMs ? n : false;
+}
+"""
+####################################
+
+
+class ReadinessWaiter:
+    """
+    Wartet auf konkrete DOM-Bedingungen statt auf feste sleeps.
+    Jede Bedingung hat einen Namen und einen eigenen Timeout (DEFAULT_WAIT_TIMEOUTS).
+    Die Dauer jeder Bedingung wird mitgeschrieben, damit die echte Latenzverteilung
+    sichtbar wird (summary / print_summary).
+
+    Thread-safe, damit die Worker im PagePool denselben Waiter nutzen können.
+    Die *_async-Varianten sind für Pages aus playwright.async_api.
+    """
+    def __init__(self, timeouts: dict = None):
+        self.timeouts       = {**DEFAULT_WAIT_TIMEOUTS, **(timeouts or {})}
+        self.timings        = defaultdict(list)
+        self.timeouts_hit   = Counter()
+        self._lock          = threading.Lock()
+
+    def _timeout(self, name: str, timeout: float = None) -> float:
+        if timeout is not None:
+            return timeout
+        return self.timeouts.get(name, DEFAULT_TIMEOUT)
+
+    def _record(self, name: str, t0: float, ok: bool):
+        with self._lock:
+            self.timings[name].append(perf_counter() - t0)
+            if not ok:
+                self.timeouts_hit[name] += 1
+
+    def selector(self, page: Page, name: str, selector: str, state: str = "attached", timeout: float = None) -> bool:
+        """
+        Wartet, bis selector den state erreicht (attached, visible, ...).
+        Returns:
+            True, wenn die Bedingung erfüllt wurde, False bei Timeout.
+        """
+        t0 = perf_counter()
+        try:
+            page.wait_for_selector(selector, state=state, timeout=self._timeout(name, timeout))
+            ok = True
+        except PlaywrightTimeoutError:
+            ok = False
+        self._record(name, t0, ok)
+        return ok
+
+    def count_settled(self, page: Page, name: str, selector: str, settle_ms: int = SETTLE_MS, timeout: float = None) -> int:
+        """
+        Wartet, bis die Anzahl der Treffer für selector größer 0 ist und sich
+        settle_ms lang nicht mehr ändert (z.B. nachgeladene Projektkarten).
+        Returns:
+            Anzahl der Treffer, 0 bei Timeout.
+        """
+        t0 = perf_counter()
+        try:
+            handle = page.wait_for_function(
+                COUNT_SETTLED_JS,
+                arg=[selector, settle_ms],
+                timeout=self._timeout(name, timeout),
+                polling=POLL_MS,
+            )
+            count = handle.json_value()
+        except PlaywrightTimeoutError:
+            count = 0
+        self._record(name, t0, bool(count))
+        return count
+
+    async def selector_async(self, page, name: str, selector: str, state: str = "attached", timeout: float = None) -> bool:
+        t0 = perf_counter()
+        try:
+            await page.wait_for_selector(selector, state=state, timeout=self._timeout(name, timeout))
+            ok = True
+        except PlaywrightTimeoutError:
+            ok = False
+        self._record(name, t0, ok)
+        return ok
+
+    async def count_settled_async(self, page, name: str, selector: str, settle_ms: int = SETTLE_MS, timeout: float = None) -> int:
+        t0 = perf_counter()
+        try:
+            handle = await page.wait_for_function(
+                COUNT_SETTLED_JS,
+                arg=[selector, settle_ms],
+                timeout=self._timeout(name, timeout),
+                polling=POLL_MS,
+            )
+            count = await handle.json_value()
+        except PlaywrightTimeoutError:
+            count = 0
+        self._record(name, t0, bool(count))
+        return count
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            dict: {bedingung: {"n", "p50", "p95", "max", "timeouts"}}, Zeiten in Sekunden.
+        """
+        out = {}
+        with self._lock:
+            for name, values in self.timings.items():
+                ordered = sorted(values)
+                out[name] = {
+                    "n": len(ordered),
+                    "p50": ordered[int(0.50 * (len(ordered) - 1))],
+                    "p95": ordered[int(0.95 * (len(ordered) - 1))],
+                    "max": ordered[-1],
+                    "timeouts": self.timeouts_hit[name],
+                }
+        return out
+
+    def print_summary(self):
+        for name, s in self.summary().items():
+            print(f"Wait {name}: n={s['n']} p50={s['p50']:.2f}s p95={s['p95']:.2f}s "
+                  f"max={s['max']:.2f}s timeouts={s['timeouts']}")
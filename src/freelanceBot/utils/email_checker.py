@@ -47,6 +47,8 @@ MAX_CONCURRENCY = 6              # parallele Requests pro Domain
 MAX_BYTES = 900_000              # bis zu 900 KB lesen
 MAX_IFRAMES_PER_PAGE = 3         # nur einige iframes verfolgen (gleiche Domain)
 DEBUG = False                    # True = Logging
+ARCHIVE = None                   # utils.PageArchive.PageArchive: jede geladene Seite ablegen (source "agency")
+URL_REWRITE = None               # Callable[[str], str]: URL vor dem Request umschreiben (z.B. auf tools/replay_server.py)
 
 # ========================= Hilfs-Regex/Utils =================================
 
@@ -259,7 +261,8 @@ async def _fetch(
         if referer:
             headers["Referer"] = referer
 
-        async with session.get(url, allow_redirects=True, headers=headers) as r:
+        fetch_url = URL_REWRITE(url) if URL_REWRITE else url
+        async with session.get(fetch_url, allow_redirects=True, headers=headers) as r:
             ctype = r.headers.get("Content-Type", "")
             meta.update({
                 "status": r.status,
@@ -270,6 +273,9 @@ async def _fetch(
             if r.status >= 400 or "text/html" not in (ctype or ""):
                 return None, meta
             raw = await r.content.read(MAX_BYTES)
+            if ARCHIVE is not None:
+                # gzip + Datei + SQLite-Commit blockieren, daher im Thread statt im Event Loop
+                await asyncio.to_thread(ARCHIVE.put, url if URL_REWRITE else str(r.url), raw, "agency", r.status, ctype)
             encoding = r.charset or "utf-8"
             try:
                 text = raw.decode(encoding, errors="ignore")
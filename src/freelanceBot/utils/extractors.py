@@ -0,0 +1,261 @@
+# extractors.py
+# XPath-Extraktoren für die Listing- und Projekt-Detailseiten von freelance.de.
+# - Eine Spezifikation pro Feld, mit Fallbacks in Prioritätsreihenfolge ("Variante 1/2")
+# - Vorkompiliert, damit viele Seiten ohne erneutes Parsen der Ausdrücke verarbeitet werden
+# - Dieselbe Spezifikation läuft im Browser (DETAIL_FIELDS_JS / LISTING_CARDS_JS, ein page.evaluate)
+#   und offline mit lxml (parse_project_detail / parse_listing)
+# - Gespeicherte HTML-Dateien lassen sich ohne Browser auf mehreren Kernen parsen (parse_files)
+# - Gesamtzahl der Treffer einer Projektliste (aus DOM-Texten oder der JSON-Antwort der Such-API)
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from lxml import etree, html
+
+# ========================= Konfiguration =====================================
+
+def _cls(name: str) -> str:
+    """XPath-Bedingung für eine CSS-Klasse (entspricht '.name' im CSS-Selektor)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Modus je Fallback:
+#   "text"       -> gesamter Text des Elements, getrimmt
+#   "first_line" -> nur die erste nicht-leere Textzeile
+#   "href"       -> Attribut href (roh, parse_listing macht es mit base_url absolut)
+DETAIL_FIELDS: Dict[str, List[Tuple[str, str]]] = {
+    "project_name": [
+        (f"(//div[{_cls('highlight-text')}])[1]//h1[@class='margin-bottom-xs']", "text"),
+    ],
+    "project_description": [
+        (f"//div[{_cls('panel-body')} and {_cls('highlight-text')}]", "text"),
+    ],
+    "company": [
+        (f"//div[{_cls('project-header')}]//a[starts-with(@onclick, 'window.open')]", "text"),
+    ],
+    "person": [
+        (f"(//div[{_cls('list-item-main')}])[1]//span[@class='h5']", "text"),
+        (f"(//div[{_cls('media-body')}])[1]//div[@class='col-md-6']", "first_line"),
+    ],
+    "email": [
+        (f"(//div[{_cls('col-sm-6')} and {_cls('margin-bottom-sm')} and contains(., 'E-Mail')])[1]"
+         f"//a[starts-with(@href, 'mailto:')]", "text"),
+        (f"(//div[{_cls('col-md-6')} and contains(., '@')])[1]//a[starts-with(@href, 'mailto:')]", "text"),
+    ],
+}
+
+# Eine Projektkarte im Listing; die Felder in LISTING_FIELDS sind relativ zur Karte.
+# LISTING_FIELDS nutzt der Browser (wie bisher FreelanceActions: zuerst der Titel-Link),
+# LISTING_FIELDS_HTTP parse_listing (wie bisher ScrapeNewEntries: zuerst der direkte Karten-Link ./a).
+LISTING_CARD_XPATH = "//search-project-card"
+
+LISTING_FIELDS: Dict[str, List[Tuple[str, str]]] = {
+    "url": [
+        (f".//a[{_cls('link-warning')} and {_cls('fw-semibold')}]", "href"),
+        ("./a", "href"),
+    ],
+    "title": [
+        (f".//a[{_cls('link-warning')} and {_cls('fw-semibold')}]", "text"),
+        ("(.//h2 | .//h3)[1]", "text"),
+    ],
+    "date": [
+        (".//time", "text"),
+        (f".//*[contains(@class, 'date') or contains(@class, 'updated')]", "first_line"),
+    ],
+}
+
+LISTING_FIELDS_HTTP: Dict[str, List[Tuple[str, str]]] = {
+    **LISTING_FIELDS,
+    "url": [
+        ("./a", "href"),
+        (f".//a[{_cls('link-warning')} and {_cls('fw-semibold')}]", "href"),
+    ],
+}
+
+# Im Browser: wertet eine Spezifikation relativ zu root mit document.evaluate aus, liefert {feld: text}.
+# Gleiche Semantik wie _extract_fields (textContent, erster nicht-leerer Textknoten bzw. href).
+_EVAL_FIELDS_JS = """
+(root, spec) => {
+    const out = {};
+    for (const [field, fallbacks] of Object.entries(spec)) {
+        let value = "";
+        for (const [xpath, mode] of fallbacks) {
+            const el = document.evaluate(
+                xpath, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+            if (el && mode === "first_line") {
+                const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+                let node;
+                while ((node = walker.nextNode())) {
+                    const t = node.textContent.trim();
+                    if (t) { value = t; break; }
+                }
+            } else if (el && mode === "href") {
+                value = (el.getAttribute("href") || "").trim();
+            } else if (el) {
+                value = (el.textContent || "").trim();
+            }
+            if (value) break;
+        }
+        out[field] = value;
+    }
+    return out;
+}
+"""
+
+# page.evaluate(DETAIL_FIELDS_JS, DETAIL_FIELDS) -> {feld: text}
+DETAIL_FIELDS_JS = f"(spec) => ({_EVAL_FIELDS_JS})(document, spec)"
+
+# page.evaluate(LISTING_CARDS_JS, [LISTING_CARD_XPATH, LISTING_FIELDS]) -> [{feld: text}, ...] pro Karte
+LISTING_CARDS_JS = f"""
+([cardXpath, spec]) => {{
+    const evalFields = {_EVAL_FIELDS_JS};
+    const cards = document.evaluate(cardXpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < cards.snapshotLength; i++) out.push(evalFields(cards.snapshotItem(i), spec));
+    return out;
+}}
+"""
+
+# Felder, die für einen vollständigen Datensatz gefüllt sein müssen
+REQUIRED_DETAIL_FIELDS = ["project_name", "company", "person", "email"]
+
+# "1.234 Projekte", "87 Ergebnisse", ...
+TOTAL_HITS_RE = re.compile(r"(\d{1,3}(?:\.\d{3})+|\d+)\s+(?:Projekte|Projektangebote|Ergebnisse|Treffer)\b", re.I)
+
+# Schlüssel, unter denen Such-APIs typischerweise die Gesamtzahl liefern (Priorität)
+TOTAL_KEYS = ("totalHits", "totalCount", "totalElements", "totalResults", "numberOfResults", "total", "count")
+
+# Läuft im Browser: Texte der Elemente, in denen die Trefferzahl üblicherweise steht
+TOTAL_HITS_TEXTS_JS = """
+() => Array.from(document.querySelectorAll(
+    'h1, h2, h3, [class*="result"], [class*="count"], [class*="total"], [class*="hits"]'
+)).map(e => e.textContent || '').filter(t => t.length < 200)
+"""
+
+def _compile(fields: Dict[str, List[Tuple[str, str]]]) -> Dict[str, list]:
+    return {field: [(etree.XPath(xp), mode) for xp, mode in specs] for field, specs in fields.items()}
+
+_COMPILED_DETAIL = _compile(DETAIL_FIELDS)
+_COMPILED_LISTING = _compile(LISTING_FIELDS_HTTP)
+_COMPILED_CARD = etree.XPath(LISTING_CARD_XPATH)
+
+# ========================= Extraktion ========================================
+
+def _element_text(el, mode: str) -> str:
+    if mode == "href":
+        return (el.get("href") or "").strip()
+    if mode == "first_line":
+        for t in el.itertext():
+            if t.strip():
+                return t.strip()
+        return ""
+    return (el.text_content() or "").strip()
+
+def parse_project_detail(html_str: str | bytes) -> Dict[str, str]:
+    """
+    Liest die Felder aus DETAIL_FIELDS aus dem HTML einer Projekt-Detailseite.
+    Pro Feld gewinnt der erste Fallback, der einen nicht-leeren Text liefert.
+    Fehlende Felder sind "".
+    """
+    return _extract_fields(html.fromstring(html_str), _COMPILED_DETAIL)
+
+def parse_listing(html_str: str | bytes, base_url: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Liest pro Projektkarte einer Listing-Seite die Felder aus LISTING_FIELDS_HTTP (url, title, date).
+    Mit base_url werden relative URLs absolut gemacht. Karten ohne URL werden übersprungen.
+    """
+    cards = []
+    for card in _COMPILED_CARD(html.fromstring(html_str)):
+        fields = _extract_fields(card, _COMPILED_LISTING)
+        if not fields["url"]:
+            continue
+        if base_url:
+            fields["url"] = urljoin(base_url, fields["url"])
+        cards.append(fields)
+    return cards
+
+def _extract_fields(root, compiled: Dict[str, list]) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for field, specs in compiled.items():
+        value = ""
+        for xpath, mode in specs:
+            hits = xpath(root)
+            if hits:
+                value = _element_text(hits[0], mode)
+            if value:
+                break
+        out[field] = value
+    return out
+
+def is_complete(fields: Optional[Dict[str, str]]) -> bool:
+    """True, wenn alle REQUIRED_DETAIL_FIELDS gefüllt sind."""
+    return bool(fields) and all(fields.get(f) for f in REQUIRED_DETAIL_FIELDS)
+
+# ========================= Offline / Bulk ====================================
+
+PARSERS = {"detail": parse_project_detail, "listing": parse_listing}
+
+def _parse_file(job: Tuple[str, str]) -> Tuple[str, Any]:
+    path, kind = job
+    return path, PARSERS[kind](Path(path).read_bytes())
+
+def parse_files(paths: Iterable[str], kind: str = "detail", workers: Optional[int] = None,
+                chunksize: int = 32) -> Iterator[Tuple[str, Any]]:
+    """
+    Parst gespeicherte HTML-Dateien ohne Browser, verteilt auf workers Prozesse (Default: alle Kerne).
+    kind: "detail" (parse_project_detail) oder "listing" (parse_listing)
+    Liefert (path, ergebnis) in der Reihenfolge von paths.
+    """
+    if kind not in PARSERS:
+        raise ValueError(f"kind must be one of {list(PARSERS)}")
+    jobs = [(str(p), kind) for p in paths]
+    if workers == 1 or len(jobs) <= 1:
+        yield from map(_parse_file, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        yield from ex.map(_parse_file, jobs, chunksize=chunksize)
+
+# ========================= Trefferzahl =======================================
+
+def total_hits_from_texts(texts: Iterable[str]) -> Optional[int]:
+    """Erste Trefferzahl ("123 Projekte") in den übergebenen Texten oder None."""
+    for t in texts:
+        m = TOTAL_HITS_RE.search(t or "")
+        if m:
+            return int(m.group(1).replace(".", ""))
+    return None
+
+def total_hits_from_json(obj: Any) -> Optional[int]:
+    """
+    Sucht in einer JSON-Antwort (Breitensuche, flachste Ebene zuerst) nach einem
+    ganzzahligen Wert unter einem der TOTAL_KEYS.
+    """
+    queue = deque([obj])
+    while queue:
+        level = [queue.popleft() for _ in range(len(queue))]
+        dicts = [d for d in level if isinstance(d, dict)]
+        for key in TOTAL_KEYS:
+            for d in dicts:
+                v = d.get(key)
+                if isinstance(v, int) and not isinstance(v, bool) and v >= 0:
+                    return v
+        for v in level:
+            if isinstance(v, dict):
+                queue.extend(v.values())
+            elif isinstance(v, list):
+                queue.extend(v)
+    return None
+
+
+if __name__ == "__main__":
+    # python utils/extractors.py detail archiv/*.html > details.jsonl
+    import json, sys
+    kind, files = sys.argv[1], sys.argv[2:]
+    for path, result in parse_files(files, kind):
+        print(json.dumps({"path": path, "result": result}, ensure_ascii=False))
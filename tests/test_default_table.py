@@ -0,0 +1,49 @@
+import datetime
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "freelanceBot"))
+
+from utils.BlobStore import LocalBlobStore
+from utils.DefaultTable import TABLE_COLS, DefaultTable
+from utils.TableBackends import CsvSnapshotBackend, PartitionedBackend
+
+
+def test_add_new_urls_on_old_schema_keeps_new_columns(tmp_path):
+    # fblist.csv aus der Zeit vor url_checked
+    store = LocalBlobStore(tmp_path)
+    store.upload("fblist.csv", b"url,date,flag01\nalt1,2026-01-02,x\n")
+
+    table = DefaultTable(backend=CsvSnapshotBackend(store))
+    assert table.add_new_urls(["n1"], "2026-10-18") == ["n1"]
+
+    row = table.get("n1")
+    assert (row["date"], row["url_checked"]) == ("2026-10-18", False)
+    assert "url_checked" in table.df.columns
+    table.close()
+
+    reloaded = DefaultTable(backend=CsvSnapshotBackend(LocalBlobStore(tmp_path)))
+    rows = reloaded.df.set_index("url")
+    assert list(reloaded.df.columns) == ["url", "date", "flag01", "url_checked"]
+    assert rows.loc["n1", "date"] == "2026-10-18"
+    assert not rows.loc["n1", "url_checked"]
+    assert rows.loc["alt1", "flag01"] == "x"
+
+
+def test_partitioned_first_insert_of_a_new_month_keeps_schema(tmp_path):
+    def backend(today):
+        return PartitionedBackend(LocalBlobStore(tmp_path), today=lambda: today, schema=TABLE_COLS)
+
+    october = DefaultTable(backend=backend(datetime.date(2026, 10, 18)))
+    october.add_new_urls(["okt1"], "2026-10-18")
+    october.close()
+
+    # erster Lauf im November: part-2026-11.csv gibt es noch nicht
+    november = DefaultTable(backend=backend(datetime.date(2026, 11, 1)))
+    assert "okt1" in november
+    assert list(november.df.columns) == TABLE_COLS
+    november.add_new_urls(["nov1"], "2026-11-01")
+    assert list(november.df.columns) == TABLE_COLS
+    row = november.get("nov1")
+    assert (row["date"], row["url_checked"]) == ("2026-11-01", False)
+    november.close()
@@ -0,0 +1,55 @@
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "freelanceBot"))
+
+import aiohttp
+from aiohttp import web
+
+from utils import email_checker
+from utils.PageArchive import PageArchive
+
+
+async def _kontakt(request):
+    return web.Response(text="<p>info@agentur.de</p>", content_type="text/html")
+
+
+async def _fetch_from_local_server(path: str):
+    app = web.Application()
+    app.router.add_get("/kontakt", _kontakt)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        async with aiohttp.ClientSession() as session:
+            return await email_checker._fetch(session, f"http://127.0.0.1:{port}{path}")
+    finally:
+        await runner.cleanup()
+
+
+def test_fetch_archives_the_page_off_the_event_loop(tmp_path, monkeypatch):
+    archive = PageArchive(tmp_path)
+    put_threads = []
+    put = archive.put
+
+    def recording_put(*args, **kwargs):
+        put_threads.append(threading.get_ident())
+        return put(*args, **kwargs)
+
+    monkeypatch.setattr(archive, "put", recording_put)
+    monkeypatch.setattr(email_checker, "ARCHIVE", archive)
+
+    text, meta = asyncio.run(_fetch_from_local_server("/kontakt"))
+
+    assert "info@agentur.de" in text
+    assert meta["status"] == 200
+    entries = list(archive.iter_entries(source="agency"))
+    assert [e["url"] for e in entries] == [meta["url"]]
+    assert archive.latest(meta["url"]) == b"<p>info@agentur.de</p>"
+    # asyncio.run läuft im Test-Thread, archiviert wird in einem Worker-Thread
+    assert put_threads and put_threads[0] != threading.get_ident()
+    archive.close()
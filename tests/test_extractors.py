@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "freelanceBot"))
+
+from utils.extractors import parse_listing
+
+CARD_WITH_BOTH_ANCHORS = """
+<html><body>
+<search-project-card>
+  <a href="/projekte/projekt-1-Karte">Karte</a>
+  <div class="card"><a class="small fw-semibold link-warning" href="/projekte/projekt-1-Titel">Projekt 1</a></div>
+</search-project-card>
+<search-project-card>
+  <div class="card"><a class="small fw-semibold link-warning" href="/projekte/projekt-2">Projekt 2</a></div>
+</search-project-card>
+</body></html>
+"""
+
+
+def test_parse_listing_prefers_the_direct_card_anchor():
+    cards = parse_listing(CARD_WITH_BOTH_ANCHORS, base_url="https://www.freelance.de/projekte")
+    assert [c["url"] for c in cards] == [
+        "https://www.freelance.de/projekte/projekt-1-Karte",
+        "https://www.freelance.de/projekte/projekt-2",
+    ]
+    assert cards[0]["title"] == "Projekt 1"
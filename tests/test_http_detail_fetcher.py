@@ -0,0 +1,19 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "freelanceBot"))
+
+from utils.HttpDetailFetcher import HttpDetailFetcher
+
+
+def test_map_reports_every_result_and_keeps_order():
+    fetcher = HttpDetailFetcher([], workers=4)
+    fetcher.intel = lambda url: {"project_name": url.upper()}
+    seen = []
+
+    urls = ["a", "b", "c", "d", "e"]
+    out = fetcher.map(urls, on_result=lambda idx, fields: seen.append((idx, fields["project_name"])))
+    fetcher.close()
+
+    assert [fields["project_name"] for fields in out] == ["A", "B", "C", "D", "E"]
+    assert sorted(seen) == [(0, "A"), (1, "B"), (2, "C"), (3, "D"), (4, "E")]
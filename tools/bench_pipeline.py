@@ -0,0 +1,249 @@
+# bench_pipeline.py
+# End-to-End-Benchmark der Scraping-Pipeline gegen tools/replay_server.py (kein Live-Traffic).
+# - Stage "freelance": FreelanceActions.scrape_freelance (Listing + Detailseiten) im Browser
+# - Stage "email": find_email_on_website_async über alle Agentur-Domains
+# - Projekte/Minute, Domains/Minute, p50/p95 pro Stufe, Peak-Speicher (RSS Python-Prozess und Kindprozesse)
+# - Ergebnis als bench_results/<git-sha>.json, --compare stellt zwei Läufe gegenüber
+#
+#   python tools/bench_pipeline.py --projects 300 --agencies 50 --latency-ms 40 --workers 4
+#   python tools/bench_pipeline.py --stages email --agencies 200
+#   python tools/bench_pipeline.py --compare bench_results/1a2b3c4.json bench_results/5d6e7f8.json
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src"))
+sys.path.append(os.path.join(ROOT, "src", "freelanceBot"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from replay_server import ReplayServer, SESSION_COOKIE
+
+RESULTS_DIR = os.path.join(ROOT, "bench_results")
+DOMAIN_CONCURRENCY = 8
+
+
+class StageTimer:
+    """
+    Sammelt Latenzen pro Stufe (thread-safe), instrumentiert Methoden für die Dauer eines Laufs.
+    """
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def instrument(self, cls, name: str, stage: str):
+        original = getattr(cls, name)
+        timer = self
+
+        def timed(*args, **kwargs):
+            t0 = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                timer.add(stage, perf_counter() - t0)
+
+        setattr(cls, name, timed)
+        try:
+            yield
+        finally:
+            setattr(cls, name, original)
+
+    def summary(self) -> dict:
+        out = {}
+        for stage, values in self.samples.items():
+            ordered = sorted(values)
+            out[stage] = {
+                "n": len(ordered),
+                "p50_ms": round(1000 * ordered[int(0.50 * (len(ordered) - 1))], 1),
+                "p95_ms": round(1000 * ordered[int(0.95 * (len(ordered) - 1))], 1),
+                "max_ms": round(1000 * ordered[-1], 1),
+            }
+        return out
+
+
+def git_revision() -> str:
+    """
+    Kurzer Commit-Hash, mit "-dirty" bei uncommitteten Änderungen.
+    """
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return f"{sha}-dirty" if dirty else sha
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def peak_rss_mb() -> dict:
+    # ru_maxrss ist unter Linux in KB; Kindprozesse (Chromium) zählen erst, nachdem sie beendet wurden
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def bench_freelance(server: ReplayServer, timer: StageTimer, workers: int, detail_mode: str, headless: bool) -> dict:
+    """
+    scrape_freelance(0) in einem temporären Arbeitsverzeichnis (Profil, Seen-Index, Checkpoint, Excel-Dateien).
+    Die Session wird über einen storage_state mit dem Cookie des Replay-Servers vorbelegt, der Key Vault wird nicht gebraucht.
+    """
+    from freelanceBot.freelance_actions import FreelanceActions, PATH_STORAGE_STATE
+    from utils.HttpDetailFetcher import HttpDetailFetcher
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench_freelance_") as tmp:
+        os.chdir(tmp)
+        try:
+            name, value = SESSION_COOKIE.split("=")
+            Path(PATH_STORAGE_STATE).parent.mkdir(parents=True, exist_ok=True)
+            Path(PATH_STORAGE_STATE).write_text(json.dumps({
+                "cookies": [{"name": name, "value": value, "domain": "127.0.0.1", "path": "/",
+                             "expires": -1, "httpOnly": False, "secure": False, "sameSite": "Lax"}],
+                "origins": [],
+            }))
+            with timer.instrument(FreelanceActions, "_listing_links", "listing_page"), \
+                 timer.instrument(FreelanceActions, "projects_intel", "detail_browser"), \
+                 timer.instrument(HttpDetailFetcher, "intel", "detail_http"):
+                t0 = perf_counter()
+                fc = FreelanceActions(headless=headless, workers=workers, detail_mode=detail_mode,
+                                      base_url=server.base_url)
+                df = fc.scrape_freelance(0)
+                seconds = perf_counter() - t0
+        finally:
+            os.chdir(cwd)
+    projects = len(df) if df is not None else 0
+    return {
+        "projects": projects,
+        "seconds": round(seconds, 2),
+        "projects_per_minute": round(60 * projects / seconds, 1) if seconds else None,
+        "phases": {k: round(v, 2) for k, v in fc.timings.items()},
+    }
+
+
+def bench_email(server: ReplayServer, timer: StageTimer, concurrency: int) -> dict:
+    """
+    Sucht für alle Agentur-Domains des Replay-Servers die E-Mail, concurrency Domains gleichzeitig.
+    """
+    from utils import email_checker
+
+    async def run(domains):
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(domain):
+            async with sem:
+                t0 = perf_counter()
+                try:
+                    return await email_checker.find_email_on_website_async(domain, email_checker.EMAIL_PARTS_DEFAULT)
+                finally:
+                    timer.add("domain", perf_counter() - t0)
+
+        return await asyncio.gather(*(one(d) for d in domains))
+
+    domains = server.agency_domains()
+    email_checker.URL_REWRITE = server.rewrite
+    try:
+        t0 = perf_counter()
+        found = asyncio.run(run(domains))
+        seconds = perf_counter() - t0
+    finally:
+        email_checker.URL_REWRITE = None
+    return {
+        "domains": len(domains),
+        "found": sum(1 for f in found if f),
+        "seconds": round(seconds, 2),
+        "domains_per_minute": round(60 * len(domains) / seconds, 1) if seconds else None,
+    }
+
+
+def flatten(result: dict, prefix: str = "") -> dict:
+    out = {}
+    for k, v in result.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            out.update(flatten(v, key + "."))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[key] = v
+    return out
+
+
+def compare(path_a: str, path_b: str):
+    a = json.loads(Path(path_a).read_text())
+    b = json.loads(Path(path_b).read_text())
+    fa, fb = flatten(a["results"]), flatten(b["results"])
+    print(f"{'metric':<45} {a['revision']:>14} {b['revision']:>14} {'delta':>9}")
+    for key in sorted(set(fa) | set(fb)):
+        va, vb = fa.get(key), fb.get(key)
+        delta = f"{(vb - va) / va:+.1%}" if va and vb is not None else ""
+        print(f"{key:<45} {va if va is not None else '-':>14} {vb if vb is not None else '-':>14} {delta:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-End-Benchmark gegen tools/replay_server.py")
+    parser.add_argument("--stages", default="freelance,email")
+    parser.add_argument("--projects", type=int, default=300)
+    parser.add_argument("--agencies", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--detail-mode", default="browser", choices=["browser", "http"])
+    parser.add_argument("--domain-concurrency", type=int, default=DOMAIN_CONCURRENCY)
+    parser.add_argument("--archive", default=None, help="aufgezeichnete Seiten (utils/PageArchive.py) statt synthetischer")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--out", default=None, help="Default: bench_results/<git-sha>.json")
+    parser.add_argument("--compare", nargs=2, metavar=("A", "B"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    server = ReplayServer(0, args.latency_ms, args.jitter_ms, args.projects, args.agencies, args.archive)
+    server.start()
+    timer = StageTimer()
+    results = {}
+    try:
+        if "freelance" in stages:
+            results["freelance"] = bench_freelance(server, timer, args.workers, args.detail_mode, not args.headed)
+        if "email" in stages:
+            results["email"] = bench_email(server, timer, args.domain_concurrency)
+    finally:
+        server.stop()
+    results["latency"] = timer.summary()
+    results["peak_rss_mb"] = peak_rss_mb()
+    results["server_requests"] = dict(server.requests)
+
+    revision = git_revision()
+    report = {
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("compare", "out")},
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{revision}.json")
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    Path(out).write_text(json.dumps(report, indent=2))
+
+    print(json.dumps(results, indent=2))
+    print(f"\nSaved to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# bench_table_backends.py
+# Latenz pro Operation von utils/DefaultTable über die Backends hinweg, auf denselben Daten:
+# - local-csv / local-log / local-parquet / local-partitioned: Blobs als Dateien (utils/BlobStore.LocalBlobStore)
+# - sqlite: utils/TableBackends.SqliteBackend (Upserts pro Zeile)
+# - azure-csv / azure-log / azure-parquet / azure-partitioned mit --azure (FBLIST_CONNECTION_STRING, z.B. Azurite)
+# Gemessen ohne batch(), d.h. jede Operation wird sofort geschrieben: load (DefaultTable()),
+# update (write_on_table auf bestehende URL), insert (add_new_urls mit einer neuen URL), delete.
+#
+#   python tools/bench_table_backends.py --rows 20000 --ops 100
+#   FBLIST_CONNECTION_STRING=UseDevelopmentStorage=true python tools/bench_table_backends.py --azure
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src", "freelanceBot"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_table_formats import synthetic_table
+
+CONTAINER = "fblist-bench"
+OPERATIONS = ["load", "update", "insert", "delete"]
+
+
+def backend_factories(tmp: str, azure: bool) -> dict:
+    from utils.BlobStore import AzureBlobStore, LocalBlobStore
+    from utils.DefaultTable import default_connection_string
+    from utils.TableBackends import (CsvSnapshotBackend, LogStructuredBackend, ParquetBackend, PartitionedBackend,
+                                     SqliteBackend)
+
+    stores = {"local": lambda: LocalBlobStore(os.path.join(tmp, "blobs"))}
+    if azure:
+        stores["azure"] = lambda: AzureBlobStore(default_connection_string, CONTAINER)
+    factories = {}
+    for location, store in stores.items():
+        factories[f"{location}-csv"] = lambda store=store: CsvSnapshotBackend(store(), "bench.csv")
+        factories[f"{location}-log"] = lambda store=store: LogStructuredBackend(store(), prefix="bench", legacy_csv=None)
+        factories[f"{location}-parquet"] = lambda store=store: ParquetBackend(store(), "bench.parquet", legacy_csv=None)
+        factories[f"{location}-partitioned"] = lambda store=store: PartitionedBackend(store(), prefix="bench-part", legacy_csv=None)
+    factories["sqlite"] = lambda: SqliteBackend(os.path.join(tmp, "bench.sqlite"), table="bench")
+    return factories
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def bench_backend(make_backend, df, ops: int) -> dict:
+    from utils.DefaultTable import DefaultTable
+
+    backend = make_backend()
+    backend.create(df)
+    backend.close()
+
+    samples = {op: [] for op in OPERATIONS}
+    urls = list(df["url"])
+    # DefaultTable meldet jede Änderung per print
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(max(1, ops // 10)):
+            t0 = perf_counter()
+            table = DefaultTable(backend=make_backend())
+            samples["load"].append(perf_counter() - t0)
+            table.close()
+
+        table = DefaultTable(backend=make_backend())
+        for i in range(ops):
+            t0 = perf_counter()
+            table.write_on_table(urls[i % len(urls)], "url_checked", True)
+            samples["update"].append(perf_counter() - t0)
+
+            t0 = perf_counter()
+            table.add_new_urls([f"https://bench.invalid/new-{i}"], "2026-10-18")
+            samples["insert"].append(perf_counter() - t0)
+
+            t0 = perf_counter()
+            table.delete_from_table(f"https://bench.invalid/new-{i}")
+            samples["delete"].append(perf_counter() - t0)
+        table.close()
+
+    return {
+        op: {
+            "n": len(values),
+            "p50_ms": round(1000 * percentile(values, 0.50), 2),
+            "p95_ms": round(1000 * percentile(values, 0.95), 2),
+            "mean_ms": round(1000 * sum(values) / len(values), 2),
+        }
+        for op, values in samples.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latenz pro Operation der DefaultTable-Backends")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--ops", type=int, default=100)
+    parser.add_argument("--backends", default=None, help="Komma-Liste, Default: alle")
+    parser.add_argument("--azure", action="store_true", help="zusätzlich gegen Azure/Azurite (FBLIST_CONNECTION_STRING)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    df = synthetic_table(args.rows)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_backends_") as tmp:
+        factories = backend_factories(tmp, args.azure)
+        names = args.backends.split(",") if args.backends else list(factories)
+        for name in names:
+            results[name] = bench_backend(factories[name], df, args.ops)
+
+    if args.json:
+        print(json.dumps({"rows": args.rows, "ops": args.ops, "results": results}, indent=2))
+        return
+    print(f"{args.rows} Zeilen, {args.ops} Operationen je Art (ohne batch), p50 / p95 in ms\n")
+    print(f"{'backend':<15}" + "".join(f"{op:>18}" for op in OPERATIONS))
+    for name, ops in results.items():
+        print(f"{name:<15}" + "".join(f"{ops[op]['p50_ms']:>9.2f} /{ops[op]['p95_ms']:>7.2f}" for op in OPERATIONS))
+
+
+if __name__ == "__main__":
+    main()
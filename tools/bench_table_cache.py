@@ -0,0 +1,109 @@
+# bench_table_cache.py
+# Kalt- gegen Warmstart von utils/DefaultTable mit dem lokalen Blob-Cache (utils/BlobStore.CachingBlobStore):
+# - cold: leerer Cache, die Tabelle wird ganz heruntergeladen
+# - warm: Cache vom vorherigen Lauf, unveränderte Blobs kosten nur einen bedingten GET ohne Body
+# - changed: ein anderer Writer hat vorher eine Zeile mit heutigem Datum angelegt (ohne Cache), die Kopie wird ersetzt
+# Pro Format: Ladezeit, übertragene Bytes, Cache-Hits/-Misses aus table.stats().
+#
+#   python tools/bench_table_cache.py --rows 200000
+#   FBLIST_CONNECTION_STRING=UseDevelopmentStorage=true python tools/bench_table_cache.py --azure
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src", "freelanceBot"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_table_formats import synthetic_table
+
+CONTAINER = "fblist-bench"
+FORMATS = ["csv", "parquet", "log", "partitioned"]
+RUNS = ["cold", "warm", "changed"]
+
+
+def make_store(args: dict):
+    from utils.BlobStore import AzureBlobStore, LocalBlobStore
+    from utils.DefaultTable import default_connection_string
+    if args["azure"]:
+        return AzureBlobStore(default_connection_string, CONTAINER)
+    return LocalBlobStore(os.path.join(args["dir"], "blobs"))
+
+
+def make_backend(store, table_format: str):
+    from utils.TableBackends import CsvSnapshotBackend, LogStructuredBackend, ParquetBackend, PartitionedBackend
+    if table_format == "parquet":
+        return ParquetBackend(store, "bench.parquet", legacy_csv=None)
+    if table_format == "log":
+        return LogStructuredBackend(store, prefix="bench-log", legacy_csv=None)
+    if table_format == "partitioned":
+        return PartitionedBackend(store, prefix="bench-part", legacy_csv=None)
+    return CsvSnapshotBackend(store, "bench.csv")
+
+
+def bench_format(args: dict, table_format: str, df) -> dict:
+    from utils.BlobStore import CachingBlobStore
+    from utils.DefaultTable import DefaultTable
+
+    make_backend(make_store(args), table_format).create(df)
+    cache_dir = os.path.join(args["dir"], f"cache-{table_format}")
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    results = {}
+    # DefaultTable meldet jede Änderung per print
+    with contextlib.redirect_stdout(io.StringIO()):
+        for run in RUNS:
+            if run == "changed":
+                other = DefaultTable(backend=make_backend(make_store(args), table_format))
+                other.add_new_urls(["https://bench.invalid/changed"], datetime.date.today().isoformat())
+                other.close()
+            store = CachingBlobStore(make_store(args), cache_dir)
+            t0 = perf_counter()
+            table = DefaultTable(backend=make_backend(store, table_format))
+            seconds = perf_counter() - t0
+            stats = table.stats()
+            table.close()
+            results[run] = {
+                "seconds": round(seconds, 3),
+                "bytes_downloaded": store.bytes_downloaded,
+                "cache_hits": stats["cache_hits"],
+                "cache_misses": stats["cache_misses"],
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kalt-/Warmstart von DefaultTable mit lokalem Blob-Cache")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Komma-Liste aus " + ", ".join(FORMATS))
+    parser.add_argument("--azure", action="store_true", help="gegen Azure/Azurite (FBLIST_CONNECTION_STRING) statt lokal")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    df = synthetic_table(args.rows)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_cache_") as tmp:
+        config = {"azure": args.azure, "dir": tmp}
+        for table_format in args.formats.split(","):
+            results[table_format] = bench_format(config, table_format, df)
+
+    if args.json:
+        print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+        return
+    print(f"{args.rows} Zeilen, Ladezeit s / MB übertragen / Cache-Hits:Misses\n")
+    print(f"{'format':<12}" + "".join(f"{run:>24}" for run in RUNS))
+    for table_format, runs in results.items():
+        print(f"{table_format:<12}" + "".join(
+            f"{r['seconds']:>8.3f} /{r['bytes_downloaded'] / 1e6:>6.2f} /{r['cache_hits']:>3}:{r['cache_misses']:<3}"
+            for r in runs.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# bench_table_formats.py
+# Vergleicht die Speicherformate von utils/DefaultTable auf denselben Daten:
+# - "csv-text": bisheriger Weg (ganzer Blob als Text, dann pd.read_csv über StringIO)
+# - "csv": CsvSnapshotBackend, direkt aus dem Blob-Stream geparst
+# - "parquet": ParquetBackend (spaltenweise, zstd)
+# Jeweils alle Spalten und nur "url": Ladezeit, übertragene Bytes, Peak-Speicher (RSS-Zuwachs)
+# Jede Messung läuft in einem frischen Prozess, damit sich Peak-Speicher nicht gegenseitig verdecken.
+#
+#   python tools/bench_table_formats.py --rows 200000
+#   FBLIST_CONNECTION_STRING=UseDevelopmentStorage=true python tools/bench_table_formats.py --azure
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+from io import StringIO
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src", "freelanceBot"))
+
+CONTAINER = "fblist-bench"
+FORMATS = ["csv-text", "csv", "parquet"]
+
+
+def make_store(args):
+    from utils.BlobStore import AzureBlobStore, LocalBlobStore
+    from utils.DefaultTable import default_connection_string
+    if args["azure"]:
+        return AzureBlobStore(default_connection_string(), CONTAINER)
+    return LocalBlobStore(args["dir"])
+
+
+def make_backend(store, table_format: str):
+    from utils.TableBackends import CsvSnapshotBackend, ParquetBackend
+    if table_format == "parquet":
+        return ParquetBackend(store, legacy_csv=None)
+    return CsvSnapshotBackend(store)
+
+
+def synthetic_table(rows: int):
+    import pandas as pd
+    return pd.DataFrame({
+        "url": [f"https://www.freelance.de/projekte/projekt-{1000000 + i}-Synthetisches-Projekt-{i}" for i in range(rows)],
+        "date": [f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}" for i in range(rows)],
+        "url_checked": [i % 3 == 0 for i in range(rows)],
+    })
+
+
+def _reset_peak_rss() -> bool:
+    # ru_maxrss erbt der Kindprozess vom Elternprozess; unter Linux lässt sich die Spitze (VmHWM) zurücksetzen
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def measure(args: dict, table_format: str, columns: list) -> dict:
+    """
+    Läuft im Kindprozess: lädt die Tabelle einmal und misst.
+    """
+    import pandas as pd
+    import pyarrow.parquet  # noqa: F401  Importe nicht mitmessen
+    store = make_store(args)
+    rss_before = _rss_kb() if _reset_peak_rss() else _peak_rss_kb()
+    t0 = perf_counter()
+    if table_format == "csv-text":
+        df = pd.read_csv(StringIO(store.download("fblist.csv").decode("utf-8")), usecols=columns)
+    else:
+        df = make_backend(store, table_format).load(columns=columns)
+    seconds = perf_counter() - t0
+    return {
+        "rows": len(df),
+        "seconds": round(seconds, 3),
+        "bytes_downloaded": store.bytes_downloaded,
+        "peak_rss_delta_mb": round((_peak_rss_kb() - rss_before) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ladezeit/Bytes/Speicher der DefaultTable-Formate")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3, help="Läufe pro Messung, berichtet wird der schnellste")
+    parser.add_argument("--azure", action="store_true", help="gegen Azure/Azurite (FBLIST_CONNECTION_STRING) statt lokal")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_table_") as tmp:
+        config = {"azure": args.azure, "dir": tmp}
+        store = make_store(config)
+        df = synthetic_table(args.rows)
+        sizes = {}
+        for table_format in ("csv", "parquet"):
+            make_backend(store, table_format).create(df)
+        sizes["csv"] = len(store.download("fblist.csv"))
+        sizes["parquet"] = len(store.download("fblist.parquet"))
+
+        ctx = multiprocessing.get_context("spawn")
+        results = []
+        for table_format in FORMATS:
+            for columns in (None, ["url"]):
+                runs = []
+                for _ in range(args.repeat):
+                    with ctx.Pool(1) as pool:
+                        runs.append(pool.apply(measure, (config, table_format, columns)))
+                best = min(runs, key=lambda r: r["seconds"])
+                best["peak_rss_delta_mb"] = max(r["peak_rss_delta_mb"] for r in runs)
+                results.append({"format": table_format, "columns": "all" if columns is None else ",".join(columns), **best})
+
+    if args.json:
+        print(json.dumps({"rows": args.rows, "stored_bytes": sizes, "results": results}, indent=2))
+        return
+    print(f"{args.rows} Zeilen, gespeichert: csv {sizes['csv'] / 1e6:.1f} MB, parquet {sizes['parquet'] / 1e6:.1f} MB\n")
+    print(f"{'format':<10} {'columns':<8} {'seconds':>8} {'MB down':>9} {'peak MB':>8}")
+    for r in results:
+        print(f"{r['format']:<10} {r['columns']:<8} {r['seconds']:>8.3f} {r['bytes_downloaded'] / 1e6:>9.1f} {r['peak_rss_delta_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
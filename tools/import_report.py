@@ -0,0 +1,101 @@
+# import_report.py
+# Import-Zeit (Kaltstart) eines Moduls pro importiertem Modul, gemessen mit python -X importtime
+# in einem frischen Interpreter (keine warmen sys.modules, kein Bytecode-Cache-Effekt durch den Aufrufer).
+#
+#   python tools/import_report.py                       # function_app, Top 25
+#   python tools/import_report.py --module ingestNewEntries --top 40
+#   python tools/import_report.py --budget-ms 400       # Exit-Code 1, wenn der Import länger dauert
+#   python tools/import_report.py --json report.json    # für den Vergleich zwischen Commits
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str, runs: int = 3) -> list:
+    """
+    Importiert module in runs frischen Interpretern und liefert pro Modul den Median.
+    Returns:
+        list: [{"module", "self_ms", "cumulative_ms", "depth"}] in Import-Reihenfolge
+    """
+    samples = defaultdict(list)
+    order = {}
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+        for line in proc.stderr.splitlines():
+            m = LINE_RE.match(line)
+            if not m:
+                continue
+            self_us, cum_us, indent, name = m.groups()
+            order.setdefault(name, (len(order), len(indent) // 2))
+            samples[name].append((int(self_us), int(cum_us)))
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    rows = []
+    for name, (idx, depth) in sorted(order.items(), key=lambda kv: kv[1][0]):
+        rows.append({
+            "module": name,
+            "self_ms": median([s for s, _ in samples[name]]) / 1000,
+            "cumulative_ms": median([c for _, c in samples[name]]) / 1000,
+            "depth": depth,
+        })
+    return rows
+
+
+def by_package(rows: list) -> dict:
+    """
+    Summe der Self-Zeit pro Top-Level-Paket (pandas, azure, lxml, ...), absteigend.
+    """
+    totals = defaultdict(float)
+    for r in rows:
+        totals[r["module"].split(".")[0]] += r["self_ms"]
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-Zeit pro Modul (python -X importtime)")
+    parser.add_argument("--module", default="function_app")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+
+    rows = measure(args.module, args.runs)
+    total = next((r["cumulative_ms"] for r in rows if r["module"] == args.module), 0.0)
+    packages = by_package(rows)
+
+    print(f"import {args.module}: {total:.1f} ms (Median aus {args.runs} Läufen, {len(rows)} Module)\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for r in sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)[:args.top]:
+        print(f"{r['cumulative_ms']:>14.1f} {r['self_ms']:>9.1f}  {r['module']}")
+    print(f"\n{'self ms':>9}  package")
+    for name, ms in list(packages.items())[:args.top]:
+        print(f"{ms:>9.1f}  {name}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"module": args.module, "total_ms": total, "packages": packages, "modules": rows}, f, indent=2)
+
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"\nimport {args.module} took {total:.1f} ms, budget is {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# replay_server.py
+# Lokaler Ersatz für freelance.de und die Agentur-Websites, damit die Pipeline ohne Live-Seiten läuft.
+# - freelance.de unter /: Listing (/projekte), Login (/login.php), Session-Check, Detailseiten
+# - Agentur-Websites unter /site/<host>/<pfad> (email_checker.URL_REWRITE = server.rewrite)
+# - Aufgezeichnete Seiten aus einem utils/PageArchive.py (--archive), sonst ein synthetischer Datensatz
+#   mit dem Markup, das utils/extractors.py erwartet
+# - Konfigurierbare Latenz pro Request (latency_ms + zufällig bis jitter_ms)
+#
+#   python tools/replay_server.py --port 8765 --projects 300 --agencies 50 --latency-ms 40
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src", "freelanceBot"))
+
+RECORDED_BASE = "https://www.freelance.de"
+SESSION_COOKIE = "replay_session=1"
+FIRST_PROJECT_ID = 100000
+# Jede NO_EMAIL_EVERY-te Agentur hat keine passende Adresse (der E-Mail-Finder scannt dann alle Pfade)
+NO_EMAIL_EVERY = 5
+
+PAGE = "<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title></head><body>{body}</body></html>"
+
+
+class SyntheticSite:
+    """
+    Deterministischer Datensatz: projects Projekte, verteilt auf agencies Agenturen.
+    """
+    def __init__(self, projects: int = 300, agencies: int = 50):
+        self.projects = projects
+        self.agencies = max(1, agencies)
+
+    def agency_domain(self, j: int) -> str:
+        return f"agency{j}.test"
+
+    def agency_domains(self) -> list:
+        return [self.agency_domain(j) for j in range(self.agencies)]
+
+    def project_path(self, i: int) -> str:
+        return f"/projekte/projekt-{FIRST_PROJECT_ID + i}-Synthetisches-Projekt-{i}"
+
+    def listing(self, page: int, page_size: int) -> str:
+        start = (page - 1) * page_size
+        cards = "".join(
+            f"<search-project-card><div class='card'>"
+            f"<a class='small fw-semibold link-warning' href='{self.project_path(i)}'>Projekt {i}</a>"
+            f"<time>17.10.2026</time></div></search-project-card>"
+            for i in range(start, min(start + page_size, self.projects))
+        )
+        pages = max(1, -(-self.projects // page_size))
+        pager = "".join(f"<li class='page-item'>{p}</li>" for p in range(1, pages + 1))
+        return PAGE.format(title="Projekte", body=f"<h1>{self.projects} Projekte</h1>{cards}<ul>{pager}</ul>")
+
+    def detail(self, i: int) -> str:
+        j = i % self.agencies
+        domain = self.agency_domain(j)
+        body = (
+            f"<div class='project-header'><a onclick=\"window.open('https://{domain}')\">Agentur {j} GmbH</a></div>"
+            f"<div class='highlight-text'><h1 class='margin-bottom-xs'>Projekt {i}</h1></div>"
+            f"<div class='panel-body highlight-text'>Beschreibung von Projekt {i}. " + "Lorem ipsum " * 40 + "</div>"
+            f"<button>Kontaktdaten anzeigen</button>"
+            f"<div class='list-item-main'><span class='h5'>Person {i}</span></div>"
+            f"<div class='col-sm-6 margin-bottom-sm'>E-Mail: <a href='mailto:person{i}@{domain}'>person{i}@{domain}</a></div>"
+        )
+        return PAGE.format(title=f"Projekt {i}", body=body)
+
+    def agency_page(self, host: str, path: str):
+        """
+        Returns:
+            str oder None (404). Die Adresse steht nur auf kontakt/impressum.
+        """
+        if not host.startswith("agency") or not host.endswith(".test"):
+            return None
+        try:
+            j = int(host[len("agency"):-len(".test")])
+        except ValueError:
+            return None
+        if j >= self.agencies:
+            return None
+        path = path.strip("/")
+        if path == "":
+            return PAGE.format(title=host, body=f"<h1>Agentur {j}</h1><a href='/kontakt'>Kontakt</a>")
+        if path in ("kontakt", "impressum"):
+            email = "" if j % NO_EMAIL_EVERY == 0 else f"<a href='mailto:info@{host}'>info@{host}</a>"
+            return PAGE.format(title=path, body=f"<h1>{path}</h1><p>Agentur {j} GmbH</p>{email}")
+        return None
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Client hat die Verbindung abgebrochen (z.B. früher Abbruch im E-Mail-Finder)
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class ReplayServer:
+    """
+    HTTP-Server im Hintergrund-Thread. start() liefert die base_url für FreelanceActions(base_url=...).
+    """
+    def __init__(self, port: int = 0, latency_ms: float = 0, jitter_ms: float = 0,
+                 projects: int = 300, agencies: int = 50, archive_dir: str = None):
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.site = SyntheticSite(projects, agencies)
+        self.archive = None
+        if archive_dir:
+            from utils.PageArchive import PageArchive
+            self.archive = PageArchive(archive_dir)
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._httpd = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def rewrite(self, url: str) -> str:
+        """
+        Agentur-URL (https://www.agency1.test/kontakt) -> URL auf diesem Server (für email_checker.URL_REWRITE).
+        """
+        parts = urlparse(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        return f"{self.base_url}/site/{parts.hostname}{path}"
+
+    def agency_domains(self) -> list:
+        return self.site.agency_domains()
+
+    def start(self) -> str:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._delay()
+                status, headers, body = server.route("GET", self.path, self.headers.get("Cookie", ""))
+                self._send(status, headers, body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                server._delay()
+                status, headers, body = server.route("POST", self.path, self.headers.get("Cookie", ""))
+                self._send(status, headers, body)
+
+            def _send(self, status, headers, body):
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = _QuietServer(("127.0.0.1", self.port), Handler)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        if self.archive is not None:
+            self.archive.close()
+
+    def _delay(self):
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def _recorded(self, urls: list):
+        if self.archive is None:
+            return None
+        for url in urls:
+            body = self.archive.latest(url)
+            if body is not None:
+                return body
+        return None
+
+    def route(self, method: str, raw_path: str, cookie: str) -> tuple:
+        """
+        Returns:
+            (status, headers, body_bytes)
+        """
+        parts = urlparse(raw_path)
+        query = parse_qs(parts.query)
+        html_headers = {"Content-Type": "text/html; charset=utf-8"}
+
+        # Agentur-Websites
+        if parts.path.startswith("/site/"):
+            self._count("agency")
+            host, _, path = parts.path[len("/site/"):].partition("/")
+            bare = host[4:] if host.startswith("www.") else host
+            recorded = self._recorded([f"{scheme}://{h}/{path}" for scheme in ("https", "http") for h in (host, bare, f"www.{bare}")])
+            if recorded is not None:
+                return 200, html_headers, recorded
+            page = self.site.agency_page(bare, path)
+            if page is None:
+                return 404, html_headers, b"not found"
+            return 200, html_headers, page.encode()
+
+        logged_in = SESSION_COOKIE in cookie
+        if parts.path == "/login.php":
+            self._count("login")
+            if method == "POST":
+                return 302, {"Location": "/myfreelance/index.php", "Set-Cookie": f"{SESSION_COOKIE}; Path=/"}, b""
+            form = ("<form method='post' action='/login.php'><input id='username' name='u'>"
+                    "<input id='password' name='p' type='password'><input type='submit' value='Login'></form>")
+            return 200, html_headers, PAGE.format(title="Login", body=form).encode()
+
+        if parts.path == "/myfreelance/index.php":
+            self._count("session")
+            if not logged_in:
+                return 302, {"Location": "/login.php"}, b""
+            return 200, html_headers, PAGE.format(title="Mein Profil", body="<h3>Mein Profil</h3><a href='/logout.php'>Logout</a>").encode()
+
+        recorded = self._recorded([RECORDED_BASE + raw_path])
+        if parts.path == "/projekte":
+            self._count("listing")
+            if recorded is not None:
+                return 200, html_headers, recorded
+            page = int(query.get("page", ["1"])[0])
+            page_size = int(query.get("pageSize", ["100"])[0])
+            return 200, html_headers, self.site.listing(page, page_size).encode()
+
+        if parts.path.startswith("/projekte/projekt-"):
+            self._count("detail")
+            if recorded is not None:
+                return 200, html_headers, recorded
+            try:
+                i = int(parts.path.split("-")[1]) - FIRST_PROJECT_ID
+            except ValueError:
+                i = -1
+            if not 0 <= i < self.site.projects:
+                return 404, html_headers, b"not found"
+            return 200, html_headers, self.site.detail(i).encode()
+
+        self._count("other")
+        if recorded is not None:
+            return 200, html_headers, recorded
+        if parts.path == "/":
+            return 200, html_headers, PAGE.format(title="freelance.de", body="<h1>Replay</h1>").encode()
+        return 404, html_headers, b"not found"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Replay-Server für freelance.de und Agentur-Websites")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--projects", type=int, default=300)
+    parser.add_argument("--agencies", type=int, default=50)
+    parser.add_argument("--archive", default=None, help="Verzeichnis eines utils/PageArchive.py")
+    args = parser.parse_args()
+
+    server = ReplayServer(args.port, args.latency_ms, args.jitter_ms, args.projects, args.agencies, args.archive)
+    print(f"Replay server on {server.start()} (Agentur-Websites unter /site/<host>/)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()